@@ -0,0 +1,251 @@
+"""
+Write-behind buffer for the agent's audit writes (artifact rows and workflow_runs.current_step).
+
+run_agent queues its writes here and returns without waiting for Postgres. A background
+thread flushes the queue every AUDIT_FLUSH_INTERVAL seconds, or as soon as AUDIT_BATCH_SIZE
+writes are waiting, as one transaction: a multi-row INSERT per table and one batched UPDATE
+for workflow_runs, with repeated updates of the same run coalesced into one. The dashboard
+summary_counters for the inserted rows are bumped in the same transaction.
+
+If the database cannot be reached the batch is appended to a local JSON-lines spool and
+retried before the next flush, so audit rows are delayed rather than lost. A batch the
+database rejects is written one record at a time; only records it refuses as data
+(IntegrityError, DataError) are dropped, and each is logged. Writes still queued in memory
+are flushed on shutdown.
+Timestamps are taken when the write is queued, not when it reaches the database.
+After each commit the orchestrator's response cache is told which tables changed.
+"""
+import atexit
+import datetime
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Any, List
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import DataError, IntegrityError, InterfaceError, OperationalError
+from database import Base, engine, SERVICE_NAME
+import models  # registers the tables in Base.metadata
+
+INCREMENT_COUNTER = text(
+    "INSERT INTO summary_counters (metric, value, count) VALUES (:metric, :value, :count) "
+    "ON CONFLICT (metric, value) DO UPDATE SET count = summary_counters.count + excluded.count, "
+    "updated_at = CURRENT_TIMESTAMP"
+)
+
+AUDIT_WRITE_BEHIND = os.getenv("AUDIT_WRITE_BEHIND", "true").lower() == "true"
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_SPOOL = Path(os.getenv("AUDIT_SPOOL_DIR", "audit_spool")) / f"{SERVICE_NAME}.jsonl"
+
+REDIS_HOST = os.getenv("REDIS_HOST")
+REDIS_PORT = int(os.getenv("REDIS_PORT") or "6379")
+# Version keys of the orchestrator's response cache (orchestrator/cache.py)
+CACHE_VERSION_PREFIX = "rcm:version:"
+
+
+def now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class AuditBuffer:
+    def __init__(self, spool_path: Path = AUDIT_SPOOL, batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval: float = AUDIT_FLUSH_INTERVAL, write_behind: bool = AUDIT_WRITE_BEHIND):
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_behind = write_behind
+        self._pending: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    def insert(self, table: str, values: Dict[str, Any]):
+        """
+        Queue a row for table. Rows of one table must all have the same columns.
+        """
+        self._enqueue({"op": "insert", "table": table, "values": values})
+
+    def update(self, table: str, key: str, key_value: Any, values: Dict[str, Any]):
+        """
+        Queue an UPDATE table SET values WHERE key = key_value.
+        """
+        self._enqueue({"op": "update", "table": table, "key": key, "key_value": key_value, "values": values})
+
+    def _enqueue(self, record: Dict[str, Any]):
+        if not self.write_behind or self._closed:
+            self._flush([record])
+            return
+        with self._cond:
+            self._pending.append(record)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                closed = self._closed
+            if batch or self.spool_path.exists():
+                self._flush(batch)
+            if closed:
+                return
+
+    def _flush(self, records: List[Dict[str, Any]]):
+        with self._flush_lock:
+            spooled = self._read_spool()
+            batch = spooled + records
+            try:
+                write_records(batch)
+            except (OperationalError, InterfaceError) as e:
+                # Database unreachable: keep the writes locally until it is back
+                print(f"Audit flush failed, spooling {len(records)} writes:", str(e))
+                self._append_spool(records)
+                return
+            except Exception as e:
+                # A bad row must not hold back the rest of the batch
+                print("Audit batch rejected, writing one by one:", str(e))
+                unwritten = self._write_one_by_one(batch)
+            else:
+                unwritten = []
+            if spooled:
+                self.spool_path.unlink()
+                print(f"Replayed {len(spooled)} spooled audit writes")
+            self._append_spool(unwritten)
+
+    def _write_one_by_one(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write the records of a rejected batch separately. Only records the database refuses
+        as data (IntegrityError, DataError) are dropped; when any other error stops a write,
+        e.g. the connection was lost meanwhile, the remaining records are returned to be spooled.
+        """
+        for position, record in enumerate(batch):
+            try:
+                write_records([record])
+            except (IntegrityError, DataError) as e:
+                print("Dropping audit write", record, str(e))
+            except Exception as e:
+                print(f"Audit write failed, spooling {len(batch) - position} writes:", str(e))
+                return batch[position:]
+        return []
+
+    def _read_spool(self) -> List[Dict[str, Any]]:
+        if not self.spool_path.exists():
+            return []
+        with self.spool_path.open() as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _append_spool(self, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spool_path.open("a") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def close(self):
+        """
+        Flush what is queued and stop the flusher. Later writes go straight to the database.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+
+def write_records(records: List[Dict[str, Any]]):
+    """
+    Write queued records in one transaction: a multi-row insert per table and a batched
+    update per (table, key, columns), the last update of a row winning.
+    """
+    if not records:
+        return
+    inserts: Dict[str, list] = defaultdict(list)
+    updates: Dict[tuple, Dict[str, Any]] = {}
+    for record in records:
+        if record["op"] == "insert":
+            inserts[record["table"]].append(record["values"])
+        else:
+            row = (record["table"], record["key"], record["key_value"])
+            updates[row] = {**updates.get(row, {}), **record["values"]}
+
+    grouped_updates: Dict[tuple, list] = defaultdict(list)
+    for (table, key, key_value), values in updates.items():
+        grouped_updates[(table, key, tuple(sorted(values)))].append(
+            {"b_key": key_value, **{f"b_{column}": value for column, value in values.items()}}
+        )
+
+    counts = summary_counts(inserts)
+    with engine.begin() as conn:
+        for table, rows in inserts.items():
+            conn.execute(Base.metadata.tables[table].insert(), rows)
+        if counts:
+            conn.execute(INCREMENT_COUNTER, counts)
+        for (table, key, columns), rows in grouped_updates.items():
+            t = Base.metadata.tables[table]
+            stmt = t.update().where(t.c[key] == bindparam("b_key")).values({column: bindparam(f"b_{column}") for column in columns})
+            conn.execute(stmt, rows)
+
+    changed = set(inserts) | {table for table, _, _ in grouped_updates}
+    if counts:
+        changed.add(models.SummaryCounter.__tablename__)
+    invalidate_cache(changed)
+
+
+def summary_counts(inserts: Dict[str, list]) -> List[Dict[str, Any]]:
+    """
+    Returns:
+        list: summary_counters increments for the inserted rows, in key order so concurrent
+        writers lock the counter rows in the same order.
+    """
+    counts = Counter()
+    for table, column in models.SUMMARY_COUNTERS:
+        for row in inserts.get(table, ()):
+            counts[(f"{table}.{column}", models.summary_value(row.get(column)))] += 1
+    return [{"metric": metric, "value": value, "count": count} for (metric, value), count in sorted(counts.items())]
+
+
+_redis = None
+
+
+def invalidate_cache(tables):
+    """
+    Bump the response-cache version of tables after a committed write. If Redis is
+    unreachable cached reads of them stay stale until their TTL runs out.
+    """
+    global _redis
+    if not REDIS_HOST or not tables:
+        return
+    try:
+        if _redis is None:
+            _redis = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, socket_timeout=0.2, socket_connect_timeout=0.2,
+                                 retry=Retry(NoBackoff(), 0))
+        pipe = _redis.pipeline(transaction=False)
+        for table in sorted(tables):
+            pipe.incr(CACHE_VERSION_PREFIX + table)
+        pipe.execute()
+    except redis.RedisError as e:
+        print("Cache invalidation failed:", str(e))
+
+
+audit_buffer = AuditBuffer()
+atexit.register(audit_buffer.close)
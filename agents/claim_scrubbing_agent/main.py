@@ -1,8 +1,9 @@
 import cohere
 import json
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 import models
+from audit import audit_buffer, now
 from typing import Dict, Any
 
 # Mock payer claim rules (in real-world this comes from payer APIs / PDFs)
@@ -21,25 +22,18 @@ payer_claim_rules = {
     },
 }
 
-def log_workflow_run(state: Dict[str, Any], db: Session):
+def log_workflow_run(state: Dict[str, Any]):
     try:
         workflow_id = state.get("workflow_id", 0)
-        run = (
-            db.query(models.WorkflowRun)
-            .filter(models.WorkflowRun.workflow_id == workflow_id)
-            .first()
-        )
-        if run:
-            run.current_step = "claim_scrubbing"
-            run.updated_at = text("CURRENT_TIMESTAMP")
-            db.commit()
-        print("Logged workflow run to database for workflow_id:", workflow_id)
+        audit_buffer.update("workflow_runs", "workflow_id", workflow_id, {"current_step": "claim_scrubbing", "updated_at": now()})
+        print("Queued workflow run update for workflow_id:", workflow_id)
     except Exception as e:
         print("Error logging workflow run:", str(e))
 
-def log_claim_scrubbed(details: Dict[str, Any], workflow_run_id: str, db: Session):
+def log_claim_scrubbed(details: Dict[str, Any], workflow_run_id: str):
     try:
-        new_claim_scrub = models.ClaimsScrubbing(
+        timestamp = now()
+        audit_buffer.insert(models.ClaimsScrubbing.__tablename__, dict(
             procedure_code=details["claim"].get("procedure_code"),
             diagnosis_code=details["claim"].get("diagnosis_code"),
             operative_report=details["claim"].get("operative_report"),
@@ -48,14 +42,11 @@ def log_claim_scrubbed(details: Dict[str, Any], workflow_run_id: str, db: Sessio
             status=details.get("status"),
             # You may want to store issues as a string or JSON
             # If you have an 'issues' column, otherwise remove this
-            created_at=text("CURRENT_TIMESTAMP"),
-            updated_at=text("CURRENT_TIMESTAMP"),
+            created_at=timestamp,
+            updated_at=timestamp,
             workflow_run_id=workflow_run_id
-        )
-
-        db.add(new_claim_scrub)
-        db.commit()
-        print("Logged claim scrubbed to database for procedure:", details.get("procedure"))
+        ))
+        print("Queued claim scrubbed for procedure:", details.get("procedure"))
     except Exception as e:
         print("Error logging claim scrubbed:", str(e))
 
@@ -84,7 +75,7 @@ def scrub_claim(claim: Dict[str, Any], procedure: str) -> Dict[str, Any]:
         "procedure": procedure,
     }
 
-def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
+def run_agent(state: Dict[str, Any]) -> Dict[str, Any]:
 
     workflow_run_id = state.get("workflow_id", 0)
 
@@ -102,9 +93,9 @@ def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
     print("=== Claims Scrubbing Agent Output ===")
     print(json.dumps(scrubbed, indent=2))
 
-    log_claim_scrubbed(details=scrubbed, workflow_run_id=workflow_run_id, db=db)
-    log_workflow_run(state=state, db=db)
+    log_claim_scrubbed(details=scrubbed, workflow_run_id=workflow_run_id)
+    log_workflow_run(state=state)
 
-    state["scrubbed_claim"] = scrubbed
+    state["claim_scrubbing"] = scrubbed
     return state
 
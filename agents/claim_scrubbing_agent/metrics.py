@@ -0,0 +1,74 @@
+"""
+Prometheus metrics for an agent, exposed on /metrics.
+
+track_run() wraps one /run call and track_llm() one LLM round-trip inside it, so the
+LLM share of each run is reported back to the orchestrator as well.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+from fastapi import Response
+from prometheus_client import Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+AGENT_RUN_DURATION = Histogram(
+    "rcm_agent_run_duration_seconds", "Wall time of run_agent",
+    ["agent", "outcome"], buckets=LATENCY_BUCKETS,
+)
+AGENT_LLM_DURATION = Histogram(
+    "rcm_agent_llm_seconds", "Wall time of a single LLM call",
+    ["agent", "model"], buckets=LATENCY_BUCKETS,
+)
+AGENT_PAYLOAD_BYTES = Histogram(
+    "rcm_agent_payload_bytes", "Size of /run request and response bodies",
+    ["agent", "direction"], buckets=SIZE_BUCKETS,
+)
+
+_current_run: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_run", default=None)
+
+
+@contextmanager
+def track_run(agent: str):
+    """
+    Time one agent run. Yields a dict that holds run_seconds and llm_seconds once the block exits.
+    """
+    run = {"run_seconds": None, "llm_seconds": 0.0}
+    token = _current_run.set({"agent": agent, "timings": run})
+    outcome = "error"
+    started = time.perf_counter()
+    try:
+        yield run
+        outcome = "success"
+    finally:
+        run["run_seconds"] = round(time.perf_counter() - started, 4)
+        run["llm_seconds"] = round(run["llm_seconds"], 4)
+        AGENT_RUN_DURATION.labels(agent, outcome).observe(run["run_seconds"])
+        _current_run.reset(token)
+
+
+@contextmanager
+def track_llm(model: str):
+    """
+    Time one LLM call and add it to the current run's llm_seconds.
+    """
+    current = _current_run.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        AGENT_LLM_DURATION.labels(current["agent"] if current else "unknown", model).observe(elapsed)
+        if current is not None:
+            current["timings"]["llm_seconds"] += elapsed
+
+
+def record_payload(agent: str, request_bytes: int, response_bytes: int):
+    AGENT_PAYLOAD_BYTES.labels(agent, "request").observe(request_bytes)
+    AGENT_PAYLOAD_BYTES.labels(agent, "response").observe(response_bytes)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,46 +1,44 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from main import run_agent
+from metrics import track_run, record_payload, metrics_response
+from wire import RunResponse, decode_request, encode_response, request_body_schema
 from pydantic import BaseModel
-from database import Base, engine, SessionLocal
-from sqlalchemy.orm import Session
 
 app = FastAPI(title="Claims Submission Agent", version="1.0.0")
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Key of the workflow state this agent produces, returned as the response's "output"
+OUTPUT_KEY = "claim_submission"
 
 class RunRequest(BaseModel):
+    """
+    Fields this agent needs from the workflow state, the orchestrator sends only these.
+    """
     workflow_type: str
-    file_path: str
     workflow_id: str
     thread_id: str
 
-@app.post("/run")
-async def run(request: RunRequest, db: Session = Depends(get_db)):
+@app.post("/run", response_model=RunResponse, openapi_extra=request_body_schema(RunRequest))
+async def run(raw_request: Request):
+
+    request = await decode_request(raw_request, RunRequest)
 
     try:
         initial_state = {
             "workflow_type": request.workflow_type, 
-            "file_path": request.file_path,
             "workflow_id": request.workflow_id,
             "thread_id": request.thread_id
         }
     
-        final_state = run_agent(db=db, state=initial_state)
-
-        return JSONResponse(
-            status_code=200,
-            content={
-                "message": "Rsn successfully",
-                "final_state": final_state
-            }
-        )
+        with track_run(OUTPUT_KEY) as timings:
+            final_state = run_agent(state=initial_state)
+
+        response = encode_response(raw_request, {
+            "message": "Rsn successfully",
+            "output": final_state.get(OUTPUT_KEY),
+            "timings": timings
+        })
+        record_payload(OUTPUT_KEY, int(raw_request.headers.get("content-length", 0)), len(response.body))
+        return response
         
     except Exception as e:
         raise HTTPException(
@@ -48,6 +46,13 @@ async def run(request: RunRequest, db: Session = Depends(get_db)):
             detail=f"Failed to upload file: {str(e)}"
         )
 
+@app.get("/metrics")
+def get_metrics():
+    """
+    Prometheus metrics: run time, LLM time and payload sizes of this agent.
+    """
+    return metrics_response()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8005)
\ No newline at end of file
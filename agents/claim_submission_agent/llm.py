@@ -0,0 +1,141 @@
+"""
+LLM backend for the agent's chat calls.
+
+LLM_MODE selects where answers come from:
+    live    call Cohere (default)
+    record  call Cohere and save every prompt -> response pair to LLM_STORE
+    replay  answer from LLM_STORE without touching the network
+
+The store is a small SQLite file keyed by a hash of (model, messages), with responses
+zlib-compressed, so recordings from all agents can share one file. In replay mode
+LLM_REPLAY_LATENCY_MS adds a fixed delay per call, or "recorded" sleeps for as long as
+the live call took; unset replays at full speed.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+from metrics import track_llm
+
+LLM_MODE = os.getenv("LLM_MODE", "live").lower()
+LLM_STORE = os.getenv("LLM_STORE", "llm_store.sqlite")
+LLM_REPLAY_LATENCY_MS = os.getenv("LLM_REPLAY_LATENCY_MS", "0")
+
+if LLM_MODE not in ("live", "record", "replay"):
+    raise ValueError(f"Invalid LLM_MODE: {LLM_MODE}")
+
+
+class ReplayMiss(RuntimeError):
+    """
+    Raised in replay mode when no recording exists for a prompt. Deliberately not a
+    KeyError, which agents treat as a malformed LLM answer and fall back from.
+    """
+
+
+class LLMStore:
+    """
+    Prompt -> response recordings in a SQLite file, safe to share between threads and agents.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, response BLOB NOT NULL, "
+                "latency_ms REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str):
+        """
+        Returns:
+            tuple: (response text, recorded latency in ms), or None if not recorded.
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT response, latency_ms FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8"), row[1]
+
+    def put(self, key: str, model: str, response: str, latency_ms: float):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, latency_ms, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, zlib.compress(response.encode("utf-8")), latency_ms, time.time()),
+            )
+            conn.commit()
+
+
+store = LLMStore(LLM_STORE)
+_client = None
+
+
+def prompt_key(model: str, messages: List[Dict[str, str]]) -> str:
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _live_chat(model: str, messages: List[Dict[str, str]]) -> str:
+    global _client
+    if _client is None:
+        import cohere
+        _client = cohere.ClientV2()
+    response = _client.chat(model=model, messages=messages)
+    return response.message.content[0].text
+
+
+def _replay_delay(recorded_ms: float) -> float:
+    if LLM_REPLAY_LATENCY_MS == "recorded":
+        return recorded_ms / 1000
+    return float(LLM_REPLAY_LATENCY_MS) / 1000
+
+
+def chat(model: str, messages: List[Dict[str, str]]) -> str:
+    """
+    Send a chat request through the configured backend.
+
+    Args:
+        model (str): Model name, e.g. command-r-plus-08-2024
+        messages (list): Chat messages [{"role", "content"}]
+
+    Returns:
+        str: Text of the first content block of the reply.
+
+    Raises:
+        ReplayMiss: In replay mode, if the prompt was never recorded.
+    """
+    key = prompt_key(model, messages)
+    with track_llm(model):
+        if LLM_MODE == "replay":
+            recorded = store.get(key)
+            if recorded is None:
+                raise ReplayMiss(f"No recorded LLM response for prompt {key[:12]}")
+            text, latency_ms = recorded
+            delay = _replay_delay(latency_ms)
+            if delay > 0:
+                time.sleep(delay)
+            return text
+
+        started = time.perf_counter()
+        text = _live_chat(model, messages)
+        if LLM_MODE == "record":
+            store.put(key, model, text, round((time.perf_counter() - started) * 1000, 1))
+        return text
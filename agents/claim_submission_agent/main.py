@@ -1,8 +1,9 @@
-import cohere
+from llm import chat
 import json
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 import models
+from audit import audit_buffer, now
 from typing import Dict, Any
 import uuid
 import datetime
@@ -26,25 +27,18 @@ payer_claim_rules = {
     },
 }
 
-def log_workflow_run(state: Dict[str, Any], db: Session):
+def log_workflow_run(state: Dict[str, Any]):
     try:
         workflow_id = state.get("workflow_id", 0)
-        run = (
-            db.query(models.WorkflowRun)
-            .filter(models.WorkflowRun.workflow_id == workflow_id)
-            .first()
-        )
-        if run:
-            run.current_step = "claim_submission"
-            run.updated_at = text("CURRENT_TIMESTAMP")
-            db.commit()
-        print("Logged workflow run to database for workflow_id:", workflow_id)
+        audit_buffer.update("workflow_runs", "workflow_id", workflow_id, {"current_step": "claim_submission", "updated_at": now()})
+        print("Queued workflow run update for workflow_id:", workflow_id)
     except Exception as e:
         print("Error logging workflow run:", str(e))
 
-def log_claim_submission(details: Dict[str, Any], workflow_run_id: str, db: Session):
+def log_claim_submission(details: Dict[str, Any], workflow_run_id: str):
     try:
-        new_claim = models.Claim(
+        timestamp = now()
+        audit_buffer.insert(models.Claim.__tablename__, dict(
             claim_id=details.get("claim_id"),
             procedure_performed=details.get("procedure_performed"),
             codes=json.dumps(details.get("codes", [])),
@@ -56,14 +50,11 @@ def log_claim_submission(details: Dict[str, Any], workflow_run_id: str, db: Sess
             tracking_id=details.get("tracking_id"),
             patient_summary=details.get("patient_summary"),
             status="pending",
-            created_at=text("CURRENT_TIMESTAMP"),
-            updated_at=text("CURRENT_TIMESTAMP"),
+            created_at=timestamp,
+            updated_at=timestamp,
             workflow_run_id=workflow_run_id
-        )
-
-        db.add(new_claim)
-        db.commit()
-        print("Logged claim submission to database for claim_id:", details.get("claim_id"))
+        ))
+        print("Queued claim submission for claim_id:", details.get("claim_id"))
     except Exception as e:
         print("Error logging claim submission:", str(e))
 
@@ -111,14 +102,13 @@ def generate_claim_submission(clinical_note: str, procedure: str) -> Dict[str, A
     }}
     """
 
-    co = cohere.ClientV2()
-    response = co.chat(
+    response = chat(
         model="command-r-plus-08-2024",
         messages=[{"role": "user", "content": prompt}],
     )
 
     try:
-        res = response.message.content[0].text.strip()
+        res = response.strip()
         claim = json.loads(res)
     except Exception as e:
         # fallback if model gives bad JSON
@@ -137,7 +127,7 @@ def generate_claim_submission(clinical_note: str, procedure: str) -> Dict[str, A
 
     return claim
 
-def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
+def run_agent(state: Dict[str, Any]) -> Dict[str, Any]:
 
     workflow_run_id = state.get("workflow_id", 0)
 
@@ -154,8 +144,8 @@ def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
     print("=== Mock Claim Submission ===")
     print(json.dumps(claim, indent=2))
 
-    log_claim_submission(details=claim, workflow_run_id=workflow_run_id, db=db)
-    log_workflow_run(state=state, db=db)
+    log_claim_submission(details=claim, workflow_run_id=workflow_run_id)
+    log_workflow_run(state=state)
 
     # Save into workflow state
     state["claim_submission"] = claim
@@ -1,6 +1,6 @@
 from concurrent.futures import thread
 from pickle import TRUE
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, Numeric, DateTime, ForeignKey, Index, func
 from database import Base
 
 """
@@ -19,14 +19,19 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     user_type = Column(String, nullable=False)
     password = Column(String, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
 class WorkflowRun(Base):
     __tablename__ = "workflow_runs"
+    __table_args__ = (
+        Index("ix_workflow_runs_status_created_at", "status", "created_at"),
+        # Monthly archival selects runs by creation time
+        Index("ix_workflow_runs_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    workflow_id = Column(String, index=True, nullable=False)
+    workflow_id = Column(String, unique=True, index=True, nullable=False)
     thread_id = Column(String, index=True, nullable=False)
     patient_id = Column(String, index=True, nullable=True)
     workflow_type = Column(String, index=True, nullable=False)
@@ -34,45 +39,61 @@ class WorkflowRun(Base):
     status = Column(String, index=True, nullable=False)
     result = Column(String, nullable=True)
     error_message = Column(String, nullable=True)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+class WorkflowStepTiming(Base):
+    __tablename__ = "workflow_step_timings"
+    id = Column(Integer, primary_key=True, index=True)
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
+    step = Column(String, index=True, nullable=False)
+    outcome = Column(String, nullable=False)
+    duration_ms = Column(Float, nullable=False)
+    request_bytes = Column(Integer, nullable=True)
+    response_bytes = Column(Integer, nullable=True)
+    llm_ms = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 class EligibilityCheck(Base):
     __tablename__ = "eligibility_checks"
+    __table_args__ = (Index("ix_eligibility_checks_created_at", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(String, index=True, nullable=True)
     insurance_id = Column(String, nullable=False)
     plan = Column(String, nullable=False)
     copay = Column(String, nullable=False)
-    eligible = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    eligible = Column(Boolean, index=True, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class PriorAuth(Base):
     __tablename__ = "prior_auths"
+    __table_args__ = (Index("ix_prior_auths_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(String, index=True, nullable=True)
     procedure_code = Column(String, nullable=False)
     auth_number = Column(String, nullable=False)
     status = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class ClinicalDocument(Base):
     __tablename__ = "clinical_documents"
+    __table_args__ = (Index("ix_clinical_documents_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(String, index=True, nullable=True)
     document_type = Column(String, nullable=False)
     content = Column(String, nullable=False)
     status = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class ClaimsScrubbing(Base):
     __tablename__ = "claims_scrubbing"
+    __table_args__ = (Index("ix_claims_scrubbing_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(String, index=True, nullable=True)
     procedure_code = Column(String, nullable=False)
@@ -81,12 +102,13 @@ class ClaimsScrubbing(Base):
     pre_op_clearance = Column(String, nullable=False)
     physician_signature = Column(String, nullable=False)
     status = Column(String, index=True, nullable=True)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class Claim(Base):
     __tablename__ = "claims"
+    __table_args__ = (Index("ix_claims_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
     claim_id = Column(String, index=True, nullable=False)
     patient_summary = Column(String, nullable=False)
@@ -99,46 +121,79 @@ class Claim(Base):
     submission_status = Column(String, nullable=False)
     tracking_id = Column(String, nullable=False)
     status = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class Resubmission(Base):
     __tablename__ = "resubmissions"
+    __table_args__ = (Index("ix_resubmissions_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
-    claim_id = Column(String, nullable=False)
+    claim_id = Column(Integer, ForeignKey("claims.id"), index=True, nullable=False)
     status = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class Denial(Base):
     __tablename__ = "denials"
+    __table_args__ = (Index("ix_denials_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
-    claim_id = Column(Integer, nullable=False)
-    resubmission_id = Column(Integer, nullable=True)
+    claim_id = Column(Integer, ForeignKey("claims.id"), index=True, nullable=False)
+    resubmission_id = Column(Integer, ForeignKey("resubmissions.id"), nullable=True)
     reason = Column(String, nullable=False)
     status = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (Index("ix_payments_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
-    claim_id = Column(Integer, nullable=False)
-    amount = Column(String, nullable=False)
+    claim_id = Column(Integer, ForeignKey("claims.id"), index=True, nullable=False)
+    amount = Column(Numeric(12, 2), nullable=False)
     status = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
 
 class Reconciliation(Base):
     __tablename__ = "reconciliations"
+    __table_args__ = (Index("ix_reconciliations_status_created_at", "status", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
-    claim_id = Column(Integer, nullable=False)
-    payment_id = Column(Integer, nullable=False)
+    claim_id = Column(Integer, ForeignKey("claims.id"), index=True, nullable=False)
+    payment_id = Column(Integer, ForeignKey("payments.id"), index=True, nullable=False)
     status = Column(String, index=True, nullable=False)
-    created_at = Column(String, nullable=False)
-    updated_at = Column(String, nullable=False)
-    workflow_run_id = Column(String, nullable=False)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    workflow_run_id = Column(String, ForeignKey("workflow_runs.workflow_id", ondelete="CASCADE"), index=True, nullable=False)
+
+# Artifact columns counted per value in summary_counters, as metric "<table>.<column>".
+# The agents bump the counters in the transaction that inserts the rows.
+SUMMARY_COUNTERS = (
+    ("eligibility_checks", "eligible"),
+    ("prior_auths", "status"),
+    ("clinical_documents", "status"),
+    ("claims_scrubbing", "status"),
+    ("claims", "status"),
+    ("claims", "submission_status"),
+    ("resubmissions", "status"),
+    ("denials", "status"),
+    ("payments", "status"),
+    ("reconciliations", "status"),
+)
+
+def summary_value(value) -> str:
+    if value is None:
+        return "unknown"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+class SummaryCounter(Base):
+    __tablename__ = "summary_counters"
+    metric = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
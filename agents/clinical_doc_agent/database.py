@@ -1,11 +1,71 @@
 import os
+import time
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool, QueuePool
+from prometheus_client import Gauge, Histogram
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Label for pool metrics and Postgres application_name (visible in pg_stat_activity)
+SERVICE_NAME = os.getenv("SERVICE_NAME", "clinical_doc_agent")
+
+# Per-service pool sizing. Every service has its own pool, so keep
+# (DB_POOL_SIZE + DB_MAX_OVERFLOW) summed over all services below Postgres max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle connections before server/firewall idle timeouts cut them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Compiled SQL statements kept per engine
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+# DATABASE_URL points at an external pooler such as PgBouncer (transaction mode):
+# connections are opened per checkout and the pooler does the pooling.
+DB_EXTERNAL_POOLER = os.getenv("DB_EXTERNAL_POOLER", "false").lower() == "true"
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "rcm_db_pool_checkout_wait_seconds", "Time to get a connection from the pool, including opening one",
+    ["service"], buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CHECKED_OUT = Gauge("rcm_db_pool_checked_out", "Connections currently checked out of the pool", ["service"])
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited, to spot connection starvation.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(SERVICE_NAME).observe(time.perf_counter() - started)
+
+
+def engine_options(url: str) -> dict:
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "query_cache_size": DB_QUERY_CACHE_SIZE}
+    if url.startswith("postgresql"):
+        options["connect_args"] = {"application_name": SERVICE_NAME}
+    if DB_EXTERNAL_POOLER:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+if isinstance(engine.pool, QueuePool):
+    POOL_CHECKED_OUT.labels(SERVICE_NAME).set_function(engine.pool.checkedout)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
@@ -2,44 +2,36 @@
 02-clinical-documentation.py: Generate clinical documentation from provider-patient transcript.
 pip install openai
 """
-import cohere
+from llm import chat
 import json
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 import models
+from audit import audit_buffer, now
 from typing import Dict, Any
 
 
-def log_workflow_run(state: Dict[str, Any], db: Session):
+def log_workflow_run(state: Dict[str, Any]):
     try:
         workflow_id = state.get("workflow_id", 0)
-        run = (
-            db.query(models.WorkflowRun)
-            .filter(models.WorkflowRun.workflow_id == workflow_id)
-            .first()
-        )
-        if run:
-            run.current_step = "clinical_doc"
-            run.updated_at = text("CURRENT_TIMESTAMP")
-            db.commit()
-        print("Logged workflow run to database for workflow_id:", workflow_id)
+        audit_buffer.update("workflow_runs", "workflow_id", workflow_id, {"current_step": "clinical_doc", "updated_at": now()})
+        print("Queued workflow run update for workflow_id:", workflow_id)
     except Exception as e:
         print("Error logging workflow run:", str(e))
 
-def log_clinical_doc(details: Dict[str, Any], workflow_run_id: str, db: Session):
+def log_clinical_doc(details: Dict[str, Any], workflow_run_id: str):
     try:
-        new_doc = models.ClinicalDocument(
+        timestamp = now()
+        audit_buffer.insert(models.ClinicalDocument.__tablename__, dict(
             patient_id=details.get("patient_id"),
             document_type="SOAP Note",
             content=json.dumps(details),
             status="Completed",
-            created_at=text("CURRENT_TIMESTAMP"),
-            updated_at=text("CURRENT_TIMESTAMP"),
+            created_at=timestamp,
+            updated_at=timestamp,
             workflow_run_id=workflow_run_id
-        )
-        db.add(new_doc)
-        db.commit()
-        print("Logged clinical document to database for patient_id:", details.get("patient_id"))
+        ))
+        print("Queued clinical document for patient_id:", details.get("patient_id"))
     except Exception as e:
         print("Error logging clinical document:", str(e))
 
@@ -84,17 +76,16 @@ def generate_clinical_doc(transcript: str):
     }}
     """
 
-    co = cohere.ClientV2()
-    response = co.chat(
+    response = chat(
         model="command-r-plus-08-2024",
         messages=[{"role": "user", "content": prompt}],
     )
 
-    res = response.message.content[0].text.strip()
+    res = response.strip()
     return json.loads(res)
     
     
-def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
+def run_agent(state: Dict[str, Any]) -> Dict[str, Any]:
 
     workflow_run_id = state.get("workflow_id", 0)
 
@@ -110,8 +101,8 @@ def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
     print("=== AI-Generated Clinical Documentation ===")
     print(clinical_doc)
 
-    log_clinical_doc(details=clinical_doc, workflow_run_id=workflow_run_id, db=db)
-    log_workflow_run(state=state, db=db)
+    log_clinical_doc(details=clinical_doc, workflow_run_id=workflow_run_id)
+    log_workflow_run(state=state)
 
     state["clinical_doc"] = clinical_doc
     return state
\ No newline at end of file
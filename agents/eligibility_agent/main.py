@@ -9,11 +9,12 @@ from PIL import Image
 from openai import OpenAI
 import json
 import requests
-import cohere
+from llm import chat
 from fastapi import FastAPI, Depends
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 import models
+from audit import audit_buffer, now
 
 # client = OpenAI()
 
@@ -24,37 +25,28 @@ mock_db = {
     "5678 1234-A": {"status": "Eligible", "plan": "Gold PPO", "copay": "$25"},
 }
 
-def log_workflow_run(state: Dict[str, Any], db: Session):
+def log_workflow_run(state: Dict[str, Any]):
     try:
         workflow_id = state.get("workflow_id", 0)
-        run = (
-            db.query(models.WorkflowRun)
-            .filter(models.WorkflowRun.workflow_id == workflow_id)
-            .first()
-        )
-        if run:
-            run.current_step = "eligibility"
-            run.updated_at = text("CURRENT_TIMESTAMP")
-            db.commit()
-        print("Logged workflow run to database for workflow_id:", workflow_id)
+        audit_buffer.update("workflow_runs", "workflow_id", workflow_id, {"current_step": "eligibility", "updated_at": now()})
+        print("Queued workflow run update for workflow_id:", workflow_id)
     except Exception as e:
         print("Error logging workflow run:", str(e))
 
 
-def log_eligibility_check(details: Dict[str, Any], workflow_run_id:str, db: Session):
+def log_eligibility_check(details: Dict[str, Any], workflow_run_id:str):
     try:
-        new_check = models.EligibilityCheck(
+        timestamp = now()
+        audit_buffer.insert(models.EligibilityCheck.__tablename__, dict(
             insurance_id=details.get("insurance_id"),
             plan=details.get("plan"),
             copay=details.get("copay"),
             eligible=details.get("eligible"),
-            created_at=text("CURRENT_TIMESTAMP"),
-            updated_at=text("CURRENT_TIMESTAMP"),
+            created_at=timestamp,
+            updated_at=timestamp,
             workflow_run_id=workflow_run_id
-        )
-        db.add(new_check)
-        db.commit()
-        print("Logged eligibility check to database for insurance_id:", details.get("insurance_id"))
+        ))
+        print("Queued eligibility check for insurance_id:", details.get("insurance_id"))
     except Exception as e:
         print("Error logging eligibility check:", str(e))
 
@@ -98,13 +90,12 @@ def extract_with_llm(text: str) -> dict:
     }}
     """
     try:
-        co = cohere.ClientV2()
-        response = co.chat(
+        response = chat(
             model="command-r-plus-08-2024",
             messages=[{"role": "user", "content": prompt}],
         )
 
-        res = response.message.content[0].text.strip()
+        res = response.strip()
         return json.loads(res)
     except (requests.RequestException, KeyError) as e:
         print("[LLM] Error:", e)
@@ -139,7 +130,7 @@ def persist_to_redis(state: Dict[str, Any], key: str = "eligibility_state") -> N
     r.set("claim:123", "eligibility_passed")
     print(r.get("claim:123"))
 
-def run_agent(state: Dict[str, Any], db: Session) -> Dict[str, Any]:
+def run_agent(state: Dict[str, Any]) -> Dict[str, Any]:
 
     workflow_run_id = state.get("workflow_id", 0)
 
@@ -156,8 +147,8 @@ def run_agent(state: Dict[str, Any], db: Session) -> Dict[str, Any]:
         state["success"] = False
         state["error_message"] = "file_path not provided"
 
-    log_workflow_run(state=state, db=db)
-    log_eligibility_check(details=state.get("eligibility", {}), workflow_run_id=workflow_run_id, db=db)
+    log_workflow_run(state=state)
+    log_eligibility_check(details=state.get("eligibility", {}), workflow_run_id=workflow_run_id)
 
     #persist_to_redis(state)
     #enqueue_task(state)
@@ -1,8 +1,9 @@
-import cohere
+from llm import chat
 import json
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 import models
+from audit import audit_buffer, now
 from typing import Dict, Any
 
 # Mock payer policy database (in real-world this comes from payer APIs / PDFs)
@@ -12,36 +13,26 @@ payer_policies = {
     "Genetic Testing": {"covered": False, "needs_docs": []},
 }
 
-def log_workflow_run(state: Dict[str, Any], db: Session):
+def log_workflow_run(state: Dict[str, Any]):
     try:
         workflow_id = state.get("workflow_id", 0)
-        run = (
-            db.query(models.WorkflowRun)
-            .filter(models.WorkflowRun.workflow_id == workflow_id)
-            .first()
-        )
-        if run:
-            run.current_step = "coded_draft_claim"
-            run.updated_at = text("CURRENT_TIMESTAMP")
-            db.commit()
-        print("Logged workflow run to database for workflow_id:", workflow_id)
+        audit_buffer.update("workflow_runs", "workflow_id", workflow_id, {"current_step": "coded_draft_claim", "updated_at": now()})
+        print("Queued workflow run update for workflow_id:", workflow_id)
     except Exception as e:
         print("Error logging workflow run:", str(e))
 
-def log_prior_auth(details: Dict[str, Any], workflow_run_id: str,  db: Session):
+def log_prior_auth(details: Dict[str, Any], workflow_run_id: str):
     try:
-        new_pa = models.PriorAuth(
+        timestamp = now()
+        audit_buffer.insert(models.PriorAuth.__tablename__, dict(
             procedure_code=details.get("requested_procedure"),
             auth_number="PA" + str(details.get("requested_procedure")) + "001",  # Mock auth number
             status="Completed",
-            created_at=text("CURRENT_TIMESTAMP"),
-            updated_at=text("CURRENT_TIMESTAMP"),
+            created_at=timestamp,
+            updated_at=timestamp,
             workflow_run_id=workflow_run_id
-        )
-
-        db.add(new_pa)
-        db.commit()
-        print("Logged prior authorization to database for procedure:", details.get("requested_procedure"))
+        ))
+        print("Queued prior authorization for procedure:", details.get("requested_procedure"))
     except Exception as e:
         print("Error logging prior authorization:", str(e))
 
@@ -91,17 +82,16 @@ def generate_prior_auth(clinical_note: str, procedure: str):
         "approval_likelihood": float (0 to 1)
     }}
     """
-    co = cohere.ClientV2()
-    response = co.chat(
+    response = chat(
         model="command-r-plus-08-2024",
         messages=[{"role": "user", "content": prompt}],
     )
 
-    res = response.message.content[0].text.strip()
+    res = response.strip()
     return json.loads(res)
 
 
-def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
+def run_agent(state: Dict[str, Any]) -> Dict[str, Any]:
 
     workflow_run_id = state.get("workflow_id", 0)
 
@@ -118,9 +108,9 @@ def run_agent(db: Session, state: Dict[str, Any]) -> Dict[str, Any]:
     print("=== AI-Generated Prior Authorization Request ===")
     print(pa_request)
 
-    log_prior_auth(details=pa_request, workflow_run_id=workflow_run_id, db=db)
-    log_workflow_run(state=state, db=db)
+    log_prior_auth(details=pa_request, workflow_run_id=workflow_run_id)
+    log_workflow_run(state=state)
 
-    state["prior_auth"] = pa_request
+    state["medical_coding"] = pa_request
     return state
 
@@ -0,0 +1,71 @@
+"""
+Wire format of the agent's /run endpoint.
+
+Requests and responses are JSON by default. An orchestrator running with
+AGENT_WIRE_FORMAT=msgpack sends Content-Type: application/msgpack and
+Accept: application/msgpack, and gets msgpack back: smaller bodies and cheaper to
+encode/decode than JSON for large clinical documents and claim packages.
+"""
+import json
+from typing import Dict, Any, Optional
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:  # JSON only
+    msgpack = None
+
+MSGPACK = "application/msgpack"
+
+
+class RunResponse(BaseModel):
+    """
+    Body of a /run response, in either wire format.
+    """
+    message: str
+    output: Optional[Dict[str, Any]] = None
+    timings: Dict[str, Optional[float]]
+
+
+def request_body_schema(model) -> Dict[str, Any]:
+    """
+    openapi_extra documenting a RunRequest model as the /run body in both wire formats.
+    """
+    schema = model.model_json_schema()
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}, MSGPACK: {"schema": schema}},
+        }
+    }
+
+
+async def decode_request(request: Request, model):
+    """
+    Parse and validate the /run body as the given RunRequest model.
+
+    Raises:
+        HTTPException: 415 for msgpack without msgpack installed, 422 for a malformed or invalid body.
+    """
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith(MSGPACK):
+            if msgpack is None:
+                raise HTTPException(status_code=415, detail="msgpack is not supported by this agent")
+            data = msgpack.unpackb(body)
+        else:
+            data = json.loads(body)
+        return model(**data)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def encode_response(request: Request, content: Dict[str, Any]) -> Response:
+    """
+    Encode the response in the format the caller accepts.
+    """
+    if msgpack is not None and MSGPACK in request.headers.get("accept", ""):
+        return Response(content=msgpack.packb(content), status_code=200, media_type=MSGPACK)
+    return JSONResponse(status_code=200, content=content)
@@ -1,35 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { ClinicalDocument } from '@/types/clinical_documents'
-
-const BACKEND_API_URL = "http://84.247.129.35:9000"
+import { fetchPage } from '@/lib/backend'
 
 export async function GET(request: NextRequest) {
   try {
-    // Fetch ALL clinical documents from backend
-    const response = await fetch(`${BACKEND_API_URL}/clinical_documents`, {
-      headers: {
-        'Authorization': `Bearer ${process.env.API_TOKEN}`,
-        'Content-Type': 'application/json',
-      },
-    })
-
-    if (!response.ok) {
-      throw new Error(`Backend API responded with ${response.status}`)
-    }
-    
-    const data = await response.json()
+    // One page of clinical documents, filtered and sorted by the backend
+    const page = await fetchPage<ClinicalDocument>('/clinical_documents', request)
 
-    console.log("Fetched clinical documents from backend:", data)
-    
-    let clinicalDocuments: ClinicalDocument[] = data.clinicalDocuments || data
+    console.log("Fetched clinical documents from backend:", page.rows.length)
 
-    console.log("Initial clinical documents:", clinicalDocuments)
-    
     return NextResponse.json({
-      clinicalDocuments,
-      total: clinicalDocuments.length
+      clinicalDocuments: page.rows,
+      nextCursor: page.nextCursor
     })
-    
   } catch (error) {
     console.error('Error fetching clinical documents:', error)
     return NextResponse.json(
@@ -37,4 +20,4 @@ export async function GET(request: NextRequest) {
       { status: 500 }
     )
   }
-}
+}
\ No newline at end of file
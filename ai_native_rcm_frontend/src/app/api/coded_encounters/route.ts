@@ -1,35 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { CodedEncounter } from '@/types/coded_encounters'
-
-const BACKEND_API_URL = "http://84.247.129.35:9000"
+import { fetchPage } from '@/lib/backend'
 
 export async function GET(request: NextRequest) {
   try {
-    // Fetch ALL coded encounters from backend
-    const response = await fetch(`${BACKEND_API_URL}/coded_encounters`, {
-      headers: {
-        'Authorization': `Bearer ${process.env.API_TOKEN}`,
-        'Content-Type': 'application/json',
-      },
-    })
-
-    if (!response.ok) {
-      throw new Error(`Backend API responded with ${response.status}`)
-    }
-    
-    const data = await response.json()
+    // One page of coded encounters, filtered and sorted by the backend
+    const page = await fetchPage<CodedEncounter>('/coded_encounters', request)
 
-    console.log("Fetched coded encounters from backend:", data)
-    
-    let codedEncounters: CodedEncounter[] = data.codedEncounters || data
+    console.log("Fetched coded encounters from backend:", page.rows.length)
 
-    console.log("Initial coded encounters:", codedEncounters)
-    
     return NextResponse.json({
-      codedEncounters,
-      total: codedEncounters.length
+      codedEncounters: page.rows,
+      nextCursor: page.nextCursor
     })
-    
   } catch (error) {
     console.error('Error fetching coded encounters:', error)
     return NextResponse.json(
@@ -37,4 +20,4 @@ export async function GET(request: NextRequest) {
       { status: 500 }
     )
   }
-}
+}
\ No newline at end of file
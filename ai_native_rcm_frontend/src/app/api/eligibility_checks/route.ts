@@ -1,35 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { EligibilityCheck } from '@/types/eligibility_checks'
-
-const BACKEND_API_URL = "http://84.247.129.35:9000"
+import { fetchPage } from '@/lib/backend'
 
 export async function GET(request: NextRequest) {
   try {
-    // Fetch ALL eligibility checks from backend
-    const response = await fetch(`${BACKEND_API_URL}/eligibility_checks`, {
-      headers: {
-        'Authorization': `Bearer ${process.env.API_TOKEN}`,
-        'Content-Type': 'application/json',
-      },
-    })
-
-    if (!response.ok) {
-      throw new Error(`Backend API responded with ${response.status}`)
-    }
-    
-    const data = await response.json()
+    // One page of eligibility checks, filtered and sorted by the backend
+    const page = await fetchPage<EligibilityCheck>('/eligibility_checks', request)
 
-    console.log("Fetched eligibility checks from backend:", data)
-    
-    let eligibilityChecks: EligibilityCheck[] = data.eligibilityChecks || data
+    console.log("Fetched eligibility checks from backend:", page.rows.length)
 
-    console.log("Initial eligibility checks:", eligibilityChecks)
-    
     return NextResponse.json({
-      eligibilityChecks,
-      total: eligibilityChecks.length
+      eligibilityChecks: page.rows,
+      nextCursor: page.nextCursor
     })
-    
   } catch (error) {
     console.error('Error fetching eligibility checks:', error)
     return NextResponse.json(
@@ -37,4 +20,4 @@ export async function GET(request: NextRequest) {
       { status: 500 }
     )
   }
-}
+}
\ No newline at end of file
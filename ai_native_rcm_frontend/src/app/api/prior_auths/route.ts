@@ -1,35 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { PriorAuth } from '@/types/prior_auths'
-
-const BACKEND_API_URL = "http://84.247.129.35:9000"
+import { fetchPage } from '@/lib/backend'
 
 export async function GET(request: NextRequest) {
   try {
-    // Fetch ALL prior auths from backend
-    const response = await fetch(`${BACKEND_API_URL}/prior_auths`, {
-      headers: {
-        'Authorization': `Bearer ${process.env.API_TOKEN}`,
-        'Content-Type': 'application/json',
-      },
-    })
-
-    if (!response.ok) {
-      throw new Error(`Backend API responded with ${response.status}`)
-    }
-    
-    const data = await response.json()
+    // One page of prior auths, filtered and sorted by the backend
+    const page = await fetchPage<PriorAuth>('/prior_auths', request)
 
-    console.log("Fetched prior auths from backend:", data)
-    
-    let priorAuths: PriorAuth[] = data.priorAuths || data
+    console.log("Fetched prior auths from backend:", page.rows.length)
 
-    console.log("Initial prior auths:", priorAuths)
-    
     return NextResponse.json({
-      priorAuths,
-      total: priorAuths.length
+      priorAuths: page.rows,
+      nextCursor: page.nextCursor
     })
-    
   } catch (error) {
     console.error('Error fetching prior auths:', error)
     return NextResponse.json(
@@ -37,4 +20,4 @@ export async function GET(request: NextRequest) {
       { status: 500 }
     )
   }
-}
+}
\ No newline at end of file
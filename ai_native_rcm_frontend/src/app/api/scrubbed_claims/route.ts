@@ -1,35 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { ScrubbedClaim } from '@/types/scrubbed_claims'
-
-const BACKEND_API_URL = "http://84.247.129.35:9000"
+import { fetchPage } from '@/lib/backend'
 
 export async function GET(request: NextRequest) {
   try {
-    // Fetch ALL scrubbed claims from backend
-    const response = await fetch(`${BACKEND_API_URL}/claims_scrubbing`, {
-      headers: {
-        'Authorization': `Bearer ${process.env.API_TOKEN}`,
-        'Content-Type': 'application/json',
-      },
-    })
-
-    if (!response.ok) {
-      throw new Error(`Backend API responded with ${response.status}`)
-    }
-    
-    const data = await response.json()
+    // One page of scrubbed claims, filtered and sorted by the backend
+    const page = await fetchPage<ScrubbedClaim>('/claims_scrubbing', request)
 
-    console.log("Fetched scrubbed claims from backend:", data)
-    
-    let scrubbedClaims: ScrubbedClaim[] = data.scrubbedClaims || data
+    console.log("Fetched scrubbed claims from backend:", page.rows.length)
 
-    console.log("Initial scrubbed claims:", scrubbedClaims)
-    
     return NextResponse.json({
-      scrubbedClaims,
-      total: scrubbedClaims.length
+      scrubbedClaims: page.rows,
+      nextCursor: page.nextCursor
     })
-    
   } catch (error) {
     console.error('Error fetching scrubbed claims:', error)
     return NextResponse.json(
@@ -37,4 +20,4 @@ export async function GET(request: NextRequest) {
       { status: 500 }
     )
   }
-}
+}
\ No newline at end of file
@@ -1,41 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { Workflow } from '@/types/workflows'
-
-const BACKEND_API_URL = "http://84.247.129.35:9000"
+import { fetchPage } from '@/lib/backend'
 
 export async function GET(request: NextRequest) {
   try {
-    // Fetch ALL workflows from backend (no sorting/filtering params)
-    const response = await fetch(`${BACKEND_API_URL}/workflows`, {
-      headers: {
-        'Authorization': `Bearer ${process.env.API_TOKEN}`, // if needed
-        'Content-Type': 'application/json',
-      },
-    })
-
-    if (!response.ok) {
-      throw new Error(`Backend API responded with ${response.status}`)
-    }
-    
-    const data = await response.json()
+    // One page of workflows, filtered and sorted by the backend
+    const page = await fetchPage<Workflow>('/workflows', request)
 
-    console.log("Fetched workflows from backend:", data)
-    
-    // Get query parameters for frontend processing
-    // const { searchParams } = new URL(request.url)
-    // const sortBy = searchParams.get('sortBy') || 'dateCreated'
-    // const sortDir = searchParams.get('sortDir') || 'desc'
-    // const status = searchParams.get('status')
-    
-    let workflows: Workflow[] = data.workflows || data // Handle different response formats
+    console.log("Fetched workflows from backend:", page.rows.length)
 
-    console.log("Initial workflows:", workflows)
-    
     return NextResponse.json({
-      workflows,
-      total: workflows.length
+      workflows: page.rows,
+      nextCursor: page.nextCursor
     })
-    
   } catch (error) {
     console.error('Error fetching workflows:', error)
     return NextResponse.json(
@@ -34,18 +34,27 @@ const statusLabels = {
 export function ClaimsTable() {
   const [claims, setClaims] = useState<Claim[]>([])
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [sortField, setSortField] = useState<SortField>('dateSubmitted')
   const [sortDirection, setSortDirection] = useState<SortDirection>('desc')
   const [statusFilter, setStatusFilter] = useState<string>('all')
 
-  const fetchClaims = async () => {
-    setLoading(true)
+  const fetchClaims = async (cursor?: string) => {
+    if (cursor) {
+      setLoadingMore(true)
+    } else {
+      setLoading(true)
+    }
     try {
       const params = new URLSearchParams({
         sortBy: sortField,
         sortDir: sortDirection,
         status: statusFilter,
       })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
       
       const response = await fetch(`/api/claims?${params}`)
       const data = await response.json()
@@ -53,7 +62,9 @@ export function ClaimsTable() {
       console.log('Fetched claims:', data)
       
       if (response.ok) {
-        setClaims(data.claims)
+        // Later pages are appended, a new sort or filter starts over from the first page
+        setClaims((previous) => cursor ? [...previous, ...data.claims] : data.claims)
+        setNextCursor(data.nextCursor)
       } else {
         console.error('Failed to fetch claims:', data.error)
       }
@@ -61,6 +72,7 @@ export function ClaimsTable() {
       console.error('Error fetching claims:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -263,6 +275,15 @@ export function ClaimsTable() {
           </TableBody>
         </Table>
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchClaims(nextCursor)} disabled={loadingMore}>
+            {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
\ No newline at end of file
@@ -46,18 +46,27 @@ const statusLabels: Record<DocumentStatus, string> = {
 export function ClinicalDocumentsTable() {
   const [documents, setDocuments] = useState<ClinicalDocument[]>([])
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [sortField, setSortField] = useState<SortField>('createdAt')
   const [sortDirection, setSortDirection] = useState<SortDirection>('desc')
   const [statusFilter, setStatusFilter] = useState<string>('all')
 
-  const fetchDocuments = async () => {
-    setLoading(true)
+  const fetchDocuments = async (cursor?: string) => {
+    if (cursor) {
+      setLoadingMore(true)
+    } else {
+      setLoading(true)
+    }
     try {
       const params = new URLSearchParams({
         sortBy: sortField,
         sortDir: sortDirection,
         status: statusFilter,
       })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
 
       const response = await fetch(`/api/clinical_documents?${params}`)
       const responseData = await response.json()
@@ -65,7 +74,9 @@ export function ClinicalDocumentsTable() {
       console.log('Fetched clinical documents:', responseData)
 
       if (response.ok) {
-        setDocuments(responseData.clinicalDocuments)
+        // Later pages are appended, a new sort or filter starts over from the first page
+        setDocuments((previous) => cursor ? [...previous, ...responseData.clinicalDocuments] : responseData.clinicalDocuments)
+        setNextCursor(responseData.nextCursor)
       } else {
         console.error('Failed to fetch clinical documents:')
       }
@@ -73,6 +84,7 @@ export function ClinicalDocumentsTable() {
       console.error('Error fetching clinical documents:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -256,6 +268,15 @@ export function ClinicalDocumentsTable() {
           </TableBody>
         </Table>
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchDocuments(nextCursor)} disabled={loadingMore}>
+            {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -51,18 +51,27 @@ const statusLabels: Record<EncounterStatus, string> = {
 export function CodedEncountersTable() {
   const [encounters, setEncounters] = useState<CodedEncounter[]>([])
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [sortField, setSortField] = useState<SortField>('createdAt')
   const [sortDirection, setSortDirection] = useState<SortDirection>('desc')
   const [statusFilter, setStatusFilter] = useState<string>('all')
 
-  const fetchEncounters = async () => {
-    setLoading(true)
+  const fetchEncounters = async (cursor?: string) => {
+    if (cursor) {
+      setLoadingMore(true)
+    } else {
+      setLoading(true)
+    }
     try {
       const params = new URLSearchParams({
         sortBy: sortField,
         sortDir: sortDirection,
         status: statusFilter,
       })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
 
       const response = await fetch(`/api/coded_encounters?${params}`)
       const responseData = await response.json()
@@ -70,7 +79,9 @@ export function CodedEncountersTable() {
       console.log('Fetched coded encounters:', responseData)
 
       if (response.ok) {
-        setEncounters(responseData.codedEncounters)
+        // Later pages are appended, a new sort or filter starts over from the first page
+        setEncounters((previous) => cursor ? [...previous, ...responseData.codedEncounters] : responseData.codedEncounters)
+        setNextCursor(responseData.nextCursor)
       } else {
         console.error('Failed to fetch coded encounters:')
       }
@@ -78,6 +89,7 @@ export function CodedEncountersTable() {
       console.error('Error fetching coded encounters:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -262,6 +274,15 @@ export function CodedEncountersTable() {
           </TableBody>
         </Table>
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchEncounters(nextCursor)} disabled={loadingMore}>
+            {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -46,18 +46,27 @@ const statusLabels: Record<EligibilityStatus, string> = {
 export function EligibilityChecksTable() {
   const [checks, setChecks] = useState<EligibilityCheck[]>([])
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [sortField, setSortField] = useState<SortField>('createdAt')
   const [sortDirection, setSortDirection] = useState<SortDirection>('desc')
   const [statusFilter, setStatusFilter] = useState<string>('all')
 
-  const fetchChecks = async () => {
-    setLoading(true)
+  const fetchChecks = async (cursor?: string) => {
+    if (cursor) {
+      setLoadingMore(true)
+    } else {
+      setLoading(true)
+    }
     try {
       const params = new URLSearchParams({
         sortBy: sortField,
         sortDir: sortDirection,
         status: statusFilter,
       })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
 
       const response = await fetch(`/api/eligibility_checks?${params}`)
       const responseData = await response.json()
@@ -65,7 +74,9 @@ export function EligibilityChecksTable() {
       console.log('Fetched eligibility checks:', responseData)
 
       if (response.ok) {
-        setChecks(responseData.eligibilityChecks)
+        // Later pages are appended, a new sort or filter starts over from the first page
+        setChecks((previous) => cursor ? [...previous, ...responseData.eligibilityChecks] : responseData.eligibilityChecks)
+        setNextCursor(responseData.nextCursor)
       } else {
         console.error('Failed to fetch eligibility checks:')
       }
@@ -73,6 +84,7 @@ export function EligibilityChecksTable() {
       console.error('Error fetching eligibility checks:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -253,6 +265,15 @@ export function EligibilityChecksTable() {
           </TableBody>
         </Table>
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchChecks(nextCursor)} disabled={loadingMore}>
+            {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -47,18 +47,27 @@ const statusLabels: Record<PriorAuthStatus, string> = {
 export function PriorAuthsTable() {
   const [priorAuths, setPriorAuths] = useState<PriorAuth[]>([])
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [sortField, setSortField] = useState<SortField>('createdAt')
   const [sortDirection, setSortDirection] = useState<SortDirection>('desc')
   const [statusFilter, setStatusFilter] = useState<string>('all')
 
-  const fetchPriorAuths = async () => {
-    setLoading(true)
+  const fetchPriorAuths = async (cursor?: string) => {
+    if (cursor) {
+      setLoadingMore(true)
+    } else {
+      setLoading(true)
+    }
     try {
       const params = new URLSearchParams({
         sortBy: sortField,
         sortDir: sortDirection,
         status: statusFilter,
       })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
 
       const response = await fetch(`/api/prior_auths?${params}`)
       const responseData = await response.json()
@@ -66,7 +75,9 @@ export function PriorAuthsTable() {
       console.log('Fetched prior auths:', responseData)
 
       if (response.ok) {
-        setPriorAuths(responseData.priorAuths)
+        // Later pages are appended, a new sort or filter starts over from the first page
+        setPriorAuths((previous) => cursor ? [...previous, ...responseData.priorAuths] : responseData.priorAuths)
+        setNextCursor(responseData.nextCursor)
       } else {
         console.error('Failed to fetch prior auths:')
       }
@@ -74,6 +85,7 @@ export function PriorAuthsTable() {
       console.error('Error fetching prior auths:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -238,6 +250,15 @@ export function PriorAuthsTable() {
           </TableBody>
         </Table>
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchPriorAuths(nextCursor)} disabled={loadingMore}>
+            {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -46,24 +46,35 @@ const statusLabels: Record<WorkflowStatus, string> = {
 export function WorkflowsTable() {
   const [workflows, setWorkflows] = useState<Workflow[]>([])
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [sortField, setSortField] = useState<SortField>('createdAt')
   const [sortDirection, setSortDirection] = useState<SortDirection>('desc')
   const [statusFilter, setStatusFilter] = useState<string>('all')
 
-  const fetchWorkflows = async () => {
-    setLoading(true)
+  const fetchWorkflows = async (cursor?: string) => {
+    if (cursor) {
+      setLoadingMore(true)
+    } else {
+      setLoading(true)
+    }
     try {
       const params = new URLSearchParams({
         sortBy: sortField,
         sortDir: sortDirection,
         status: statusFilter,
       })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
 
       const response = await fetch(`/api/workflows?${params}`)
       const responseData = await response.json()
 
       if (response.ok) {
-        setWorkflows(responseData.workflows)
+        // Later pages are appended, a new sort or filter starts over from the first page
+        setWorkflows((previous) => cursor ? [...previous, ...responseData.workflows] : responseData.workflows)
+        setNextCursor(responseData.nextCursor)
       } else {
         console.error('Failed to fetch workflows:')
       }
@@ -71,6 +82,7 @@ export function WorkflowsTable() {
       console.error('Error fetching workflows:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -235,6 +247,15 @@ export function WorkflowsTable() {
           </TableBody>
         </Table>
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchWorkflows(nextCursor)} disabled={loadingMore}>
+            {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -0,0 +1,44 @@
+const BACKEND_API_URL = "http://84.247.129.35:9000"
+
+// Table query parameters the backend list endpoints understand
+const FORWARDED_PARAMS = ['limit', 'cursor', 'sortBy', 'sortDir', 'status']
+
+export interface Page<T> {
+  rows: T[]
+  // Pass back as `cursor` to get the following page, null on the last page
+  nextCursor: string | null
+}
+
+/**
+ * Fetch one page of a backend list endpoint.
+ *
+ * limit, cursor, sortBy, sortDir and status are forwarded from the incoming request; the
+ * backend does the filtering, sorting and keyset paging, and puts the cursor of the next
+ * page in the X-Next-Cursor header.
+ */
+export async function fetchPage<T>(path: string, request: Request): Promise<Page<T>> {
+  const { searchParams } = new URL(request.url)
+  const params = new URLSearchParams()
+  for (const name of FORWARDED_PARAMS) {
+    const value = searchParams.get(name)
+    if (value) {
+      params.set(name, value)
+    }
+  }
+
+  const response = await fetch(`${BACKEND_API_URL}${path}?${params}`, {
+    headers: {
+      'Authorization': `Bearer ${process.env.API_TOKEN}`,
+      'Content-Type': 'application/json',
+    },
+  })
+
+  if (!response.ok) {
+    throw new Error(`Backend API responded with ${response.status}`)
+  }
+
+  return {
+    rows: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  }
+}
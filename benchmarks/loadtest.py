@@ -0,0 +1,386 @@
+"""
+Offline end-to-end load test for the orchestrator.
+
+Runs the real orchestrator app in-process against stub agents and a fake Cohere endpoint
+(see stubs.py), drives POST /run at a fixed arrival rate and reports throughput and
+p50/p95/p99 latency per workflow_type and per step. No Docker, Postgres or network needed:
+the database is a throwaway SQLite file and checkpoints are kept in memory.
+
+Usage:
+    pip install -r orchestrator/requirements.txt
+    python benchmarks/loadtest.py --rate 20 --duration 30 --workflow-type full
+    python benchmarks/loadtest.py --rate 20 --duration 30 --output after.json --compare before.json
+
+With --compare the run exits non-zero when throughput drops or any p95 grows by more than
+--tolerance against the baseline report, so it can gate performance changes.
+
+After the load, one run is failed on purpose and resumed, the SSE endpoint is read for a
+run this process has no events for, and a month whose claim is referenced by a later run is
+archived; the test exits non-zero if any of them misbehaves.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Any, List
+
+ROOT = Path(__file__).resolve().parent.parent
+ORCHESTRATOR_DIR = ROOT / "orchestrator"
+SAMPLE_FILE = ROOT / "sample_media" / "medical_card.png"
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples: List[float], pct: int) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, -(-len(ordered) * pct // 100) - 1))
+    return round(ordered[index], 1)
+
+
+def latency_summary(samples: List[float]) -> Dict[str, Any]:
+    return {"count": len(samples), **{f"p{pct}_ms": percentile(samples, pct) for pct in PERCENTILES}}
+
+
+class Results:
+    def __init__(self):
+        self.submitted = defaultdict(int)
+        self.rejected = defaultdict(int)
+        self.failed = defaultdict(int)
+        self.workflow_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.step_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.first_submit = None
+        self.last_finish = None
+
+    def report(self, args) -> Dict[str, Any]:
+        completed = sum(len(samples) for samples in self.workflow_latencies.values())
+        elapsed = (self.last_finish - self.first_submit) if self.first_submit and self.last_finish else 0.0
+        return {
+            "config": {
+                "rate": args.rate,
+                "duration": args.duration,
+                "workflow_types": args.workflow_type,
+                "llm_latency_ms": args.llm_latency_ms,
+                "llm_jitter_ms": args.llm_jitter_ms,
+                "agent_latency_ms": args.agent_latency_ms,
+            },
+            "elapsed_seconds": round(elapsed, 2),
+            "completed": completed,
+            "throughput_per_second": round(completed / elapsed, 2) if elapsed else 0.0,
+            "workflow_types": {
+                workflow_type: {
+                    "submitted": self.submitted[workflow_type],
+                    "rejected": self.rejected[workflow_type],
+                    "failed": self.failed[workflow_type],
+                    **latency_summary(self.workflow_latencies[workflow_type]),
+                }
+                for workflow_type in sorted(self.submitted)
+            },
+            "steps": {step: latency_summary(samples) for step, samples in sorted(self.step_latencies.items())},
+        }
+
+
+def configure_environment(args, workdir: Path):
+    """
+    Point the orchestrator at throwaway local storage. Must run before its modules are imported,
+    they read their configuration at import time.
+    """
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir / 'loadtest.db'}?check_same_thread=false&timeout=30"
+    os.environ["CHECKPOINT_BACKEND"] = "memory"
+    os.environ["UPLOAD_DIR"] = str(workdir / "uploads")
+    os.environ["ARCHIVE_DIR"] = str(workdir / "archive")
+    os.environ["AGENT_HTTP2"] = "false"
+    if args.max_in_flight:
+        os.environ["ADMISSION_MAX_IN_FLIGHT"] = str(args.max_in_flight)
+    sys.path.insert(0, str(ORCHESTRATOR_DIR))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+async def run_lifecycle_handlers(handlers):
+    for handler in handlers:
+        result = handler()
+        if inspect.isawaitable(result):
+            await result
+
+
+async def run_one(client, workflow_events, workflow_type: str, upload: bytes, results: Results):
+    """
+    Submit one run and follow its events until it completes or fails.
+    """
+    started = time.perf_counter()
+    results.submitted[workflow_type] += 1
+    resp = await client.post(
+        "/run",
+        data={"workflow_type": workflow_type},
+        files={"file": (SAMPLE_FILE.name, upload, "image/png")},
+    )
+    if resp.status_code == 429:
+        results.rejected[workflow_type] += 1
+        return
+    if resp.status_code >= 400:
+        print(f"/run answered {resp.status_code}: {resp.text}")
+        results.failed[workflow_type] += 1
+        return
+
+    workflow_id = resp.json()["workflow_id"]
+    async for message in workflow_events.subscribe(workflow_id):
+        if message is None:
+            continue
+        if message["event"] == "step-finished":
+            results.step_latencies[message["step"]].append(message["latency_ms"])
+        elif message["event"] == "workflow-completed":
+            results.workflow_latencies[workflow_type].append((time.perf_counter() - started) * 1000)
+        elif message["event"] == "workflow-failed":
+            results.failed[workflow_type] += 1
+    results.last_finish = time.perf_counter()
+
+
+async def follow(workflow_events, workflow_id: str) -> str:
+    """
+    Returns:
+        str: The terminal event of the run, workflow-completed or workflow-failed.
+    """
+    async for message in workflow_events.subscribe(workflow_id):
+        if message is not None and message["event"] in ("workflow-completed", "workflow-failed"):
+            return message["event"]
+
+
+async def check_resume_and_events(client, workflow_events, router, upload: bytes) -> List[str]:
+    """
+    Fail the last step of a full run, resume it, and read its events the way a client does
+    after an orchestrator restart.
+    Returns:
+        list: Problems found, empty when resume and events behave.
+    """
+    from stubs import AGENT_HOSTS
+
+    problems = []
+    last_host = AGENT_HOSTS["claim_submission"]
+    router.failing.add(last_host)
+    try:
+        resp = await client.post("/run", data={"workflow_type": "full"}, files={"file": (SAMPLE_FILE.name, upload, "image/png")})
+        workflow_id = resp.json()["workflow_id"]
+        if await follow(workflow_events, workflow_id) != "workflow-failed":
+            return [f"run {workflow_id} did not fail with claim_submission down"]
+    finally:
+        router.failing.discard(last_host)
+
+    calls_before = dict(router.calls)
+    resp = await client.post(f"/workflows/{workflow_id}/resume")
+    if resp.status_code != 202 or resp.json()["next_steps"] != ["claim_submission"]:
+        return [f"resume answered {resp.status_code}: {resp.text}"]
+    # The failed attempt's events are still in the history until the resumed run starts,
+    # so wait for the run itself to finish instead
+    from main import active_workflows
+    while workflow_id in active_workflows:
+        await asyncio.sleep(0.01)
+    status = (await client.get(f"/workflows/{workflow_id}")).json()["status"]
+    if status != "completed":
+        problems.append(f"resumed run {workflow_id} ended {status}")
+    rerun = sorted(host for host, count in router.calls.items() if host != last_host and count != calls_before.get(host, 0))
+    if rerun:
+        problems.append(f"resume re-ran finished steps: {rerun}")
+
+    resp = await client.post(f"/workflows/{workflow_id}/resume")
+    if resp.status_code != 409:
+        problems.append(f"resume of a completed run answered {resp.status_code}, expected 409")
+
+    # No history in memory, as after a restart: the final status comes from the database
+    workflow_events._history.pop(workflow_id, None)
+    resp = await client.get(f"/workflows/{workflow_id}/events")
+    if resp.status_code != 200 or '"event": "workflow-completed"' not in resp.text:
+        problems.append(f"events of a finished run answered {resp.status_code}: {resp.text}")
+    return problems
+
+
+def check_archive_references() -> List[str]:
+    """
+    Archive a month whose claim a later, still hot run has denied, paid and reconciled: those
+    rows must leave the database with the claim (on Postgres the claim's delete would otherwise
+    fail on their foreign keys) while the later run itself stays.
+    Returns:
+        list: Problems found, empty when the month archives cleanly.
+    """
+    import datetime
+    import uuid
+    import archive
+    import models
+    from database import SessionLocal
+
+    old_run, new_run = str(uuid.uuid4()), str(uuid.uuid4())
+    db = SessionLocal()
+    try:
+        db.add_all([
+            models.WorkflowRun(workflow_id=old_run, thread_id=old_run, workflow_type="full", status="completed",
+                               created_at=datetime.datetime(2000, 1, 15, tzinfo=datetime.timezone.utc)),
+            models.WorkflowRun(workflow_id=new_run, thread_id=new_run, workflow_type="full", status="completed"),
+        ])
+        db.flush()
+        claim = models.Claim(claim_id="CLM-ARCHIVE", patient_summary="", procedure_performed="", codes="[]", documentation="[]",
+                             payer="{}", provider="{}", submission_date="2000-01-15", submission_status="accepted",
+                             tracking_id="CH-ARCHIVE", status="denied", workflow_run_id=old_run)
+        db.add(claim)
+        db.flush()
+        resubmission = models.Resubmission(claim_id=claim.id, status="pending", workflow_run_id=new_run)
+        payment = models.Payment(claim_id=claim.id, amount=100, status="paid", workflow_run_id=new_run)
+        db.add_all([resubmission, payment])
+        db.flush()
+        db.add_all([
+            models.Denial(claim_id=claim.id, resubmission_id=resubmission.id, reason="CO-16", status="open", workflow_run_id=new_run),
+            models.Reconciliation(claim_id=claim.id, payment_id=payment.id, status="matched", workflow_run_id=new_run),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    try:
+        manifest = archive.archive_month("2000-01")
+    except Exception as e:
+        return [f"archiving a month with referenced claims failed: {e}"]
+
+    problems = []
+    for model in (models.Claim, models.Resubmission, models.Denial, models.Payment, models.Reconciliation):
+        archived = manifest["rows"].get(model.__tablename__)
+        if archived != 1:
+            problems.append(f"archived {archived} {model.__tablename__} rows, expected 1")
+    db = SessionLocal()
+    try:
+        left = db.query(models.Denial).filter(models.Denial.workflow_run_id == new_run).count()
+        if left:
+            problems.append(f"{left} denials of the archived claim left in the database")
+        if db.query(models.WorkflowRun).filter(models.WorkflowRun.workflow_id == new_run).count() != 1:
+            problems.append("the later run was archived with the claim it references")
+    finally:
+        db.close()
+    return problems
+
+
+async def drive(args) -> Dict[str, Any]:
+    import httpx
+    from api import app
+    from database import Base, engine
+    from events import workflow_events
+    from transport import agent_transport
+    from stubs import build_stub_agents
+
+    # Throwaway database, no migration history to keep
+    Base.metadata.create_all(bind=engine)
+    router, llm_client = build_stub_agents(args.llm_latency_ms, args.llm_jitter_ms, args.agent_latency_ms, args.seed)
+    agent_transport.transport = router
+
+    await run_lifecycle_handlers(app.router.on_startup)
+    upload = SAMPLE_FILE.read_bytes()
+    results = Results()
+    runs = set()
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://orchestrator", timeout=None) as client:
+            total = int(args.rate * args.duration)
+            interval = 1.0 / args.rate
+            results.first_submit = time.perf_counter()
+            # Open-loop arrivals: requests go out on schedule whether or not earlier ones have finished
+            for i in range(total):
+                delay = results.first_submit + i * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                workflow_type = args.workflow_type[i % len(args.workflow_type)]
+                run = asyncio.create_task(run_one(client, workflow_events, workflow_type, upload, results))
+                runs.add(run)
+                run.add_done_callback(runs.discard)
+
+            if runs:
+                _, pending = await asyncio.wait(set(runs), timeout=args.drain_timeout)
+                if pending:
+                    print(f"{len(pending)} runs still in progress after {args.drain_timeout}s, not counted")
+                    for run in pending:
+                        run.cancel()
+
+            problems = await check_resume_and_events(client, workflow_events, router, upload)
+            problems += check_archive_references()
+    finally:
+        await run_lifecycle_handlers(app.router.on_shutdown)
+        await llm_client.aclose()
+
+    return {**results.report(args), "problems": problems}
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\ncompleted {report['completed']} runs in {report['elapsed_seconds']}s, "
+          f"{report['throughput_per_second']} runs/s\n")
+    header = f"{'workflow_type':<24}{'sent':>7}{'429':>7}{'failed':>8}{'done':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    for workflow_type, row in report["workflow_types"].items():
+        print(f"{workflow_type:<24}{row['submitted']:>7}{row['rejected']:>7}{row['failed']:>8}{row['count']:>7}"
+              f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+    print(f"\n{'step':<24}{'done':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, row in report["steps"].items():
+        print(f"{step:<24}{row['count']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Returns:
+        list: Regressions of this report against the baseline, empty if none.
+    """
+    regressions = []
+    if report["throughput_per_second"] < baseline["throughput_per_second"] * (1 - tolerance):
+        regressions.append(f"throughput {report['throughput_per_second']}/s < baseline {baseline['throughput_per_second']}/s")
+    for section in ("workflow_types", "steps"):
+        for name, row in report[section].items():
+            before = baseline[section].get(name)
+            if before and before["count"] and row["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{name} p95 {row['p95_ms']}ms > baseline {before['p95_ms']}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the RCM orchestrator")
+    parser.add_argument("--rate", type=float, default=10, help="Runs submitted per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to keep submitting")
+    parser.add_argument("--workflow-type", action="append", help="Workflow type to submit, repeat to mix (default: full)")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="Fake Cohere response time")
+    parser.add_argument("--llm-jitter-ms", type=float, default=400, help="Extra uniform random LLM latency")
+    parser.add_argument("--agent-latency-ms", type=float, default=5, help="Stub agent work outside the LLM call")
+    parser.add_argument("--max-in-flight", type=int, help="Override ADMISSION_MAX_IN_FLIGHT")
+    parser.add_argument("--drain-timeout", type=float, default=300, help="Seconds to wait for runs after the last submit")
+    parser.add_argument("--database-url", help="Database to use instead of a throwaway SQLite file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed regression against the baseline (0.1 = 10%%)")
+    args = parser.parse_args()
+    args.workflow_type = args.workflow_type or ["full"]
+
+    with tempfile.TemporaryDirectory(prefix="rcm-loadtest-") as workdir:
+        configure_environment(args, Path(workdir))
+        report = asyncio.run(drive(args))
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    for problem in report["problems"]:
+        print(f"CHECK FAILED: {problem}")
+    if report["problems"]:
+        sys.exit(1)
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+JSON vs msgpack for the orchestrator <-> agent /run bodies.
+
+For each payload it reports the encoded size and the time to encode and decode it, plus a
+full /run round trip as the two sides do it: orchestrator encodes the request, agent decodes
+and validates it with Pydantic, agent encodes the response, orchestrator decodes it.
+
+Usage:
+    pip install msgpack pydantic
+    python benchmarks/serialization.py --doc-kb 64 --claim-lines 500
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict, Any, Callable
+
+import msgpack
+from pydantic import BaseModel
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from stubs import STUB_OUTPUTS  # noqa: E402
+
+
+class RunRequest(BaseModel):
+    workflow_type: str
+    file_path: str
+    workflow_id: str
+    thread_id: str
+
+
+REQUEST = {
+    "workflow_type": "full",
+    "file_path": "/uploads/blobs/3f/3f2a9c0d5e1b7a4c8d6e2f0a1b3c5d7e9f1a2b4c6d8e0f2a4b6c8d0e2f4a6b8c",
+    "workflow_id": "6f1c2b8e-4a7d-4c1e-9b0a-2d3e4f5a6b7c",
+    "thread_id": "9a8b7c6d-5e4f-4a3b-2c1d-0e9f8a7b6c5d",
+}
+
+FORMATS: Dict[str, Dict[str, Callable]] = {
+    "json": {"encode": lambda obj: json.dumps(obj).encode("utf-8"), "decode": json.loads},
+    "msgpack": {"encode": msgpack.packb, "decode": msgpack.unpackb},
+}
+
+
+def response(output: Dict[str, Any]) -> Dict[str, Any]:
+    return {"message": "Ran successfully", "output": output, "timings": {"run_seconds": 1.2345, "llm_seconds": 1.1}}
+
+
+def large_clinical_doc(kb: int) -> Dict[str, Any]:
+    note = STUB_OUTPUTS["clinical_doc"]
+    sentence = "Patient reports intermittent chest tightness on exertion, relieved by rest and inhaler use. "
+    body = (sentence * (kb * 1024 // len(sentence) + 1))[: kb * 1024]
+    return {**note, "subjective": body, "icd10_codes": note["icd10_codes"] * 20, "cpt_codes": note["cpt_codes"] * 20}
+
+
+def large_claim(lines: int) -> Dict[str, Any]:
+    claim = dict(STUB_OUTPUTS["claim_submission"])
+    claim["service_lines"] = [
+        {"line": i + 1, "cpt": "99214", "icd10": ["J45.901", "M17.11"], "units": 1, "charge": 185.0, "modifiers": ["25"]}
+        for i in range(lines)
+    ]
+    return claim
+
+
+def payloads(args) -> Dict[str, Dict[str, Any]]:
+    return {
+        "request": REQUEST,
+        "eligibility response": response(STUB_OUTPUTS["eligibility"]),
+        "clinical_doc response": response(STUB_OUTPUTS["clinical_doc"]),
+        "claim_submission response": response(STUB_OUTPUTS["claim_submission"]),
+        f"clinical_doc {args.doc_kb}KB response": response(large_clinical_doc(args.doc_kb)),
+        f"claim {args.claim_lines} lines response": response(large_claim(args.claim_lines)),
+    }
+
+
+def per_call_us(fn: Callable, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def round_trip(fmt: Dict[str, Callable], body: Dict[str, Any]):
+    request = fmt["decode"](fmt["encode"](REQUEST))
+    RunRequest(**request)
+    return fmt["decode"](fmt["encode"](body))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs msgpack for agent /run bodies")
+    parser.add_argument("--doc-kb", type=int, default=64, help="Size of the large clinical document")
+    parser.add_argument("--claim-lines", type=int, default=500, help="Service lines in the large claim")
+    parser.add_argument("--number", type=int, default=200, help="Calls per timing sample")
+    args = parser.parse_args()
+
+    print(f"{'payload':<32}{'format':<9}{'bytes':>10}{'encode us':>12}{'decode us':>12}{'/run trip us':>14}")
+    for name, body in payloads(args).items():
+        for fmt_name, fmt in FORMATS.items():
+            encoded = fmt["encode"](body)
+            encode_us = per_call_us(lambda: fmt["encode"](body), args.number)
+            decode_us = per_call_us(lambda: fmt["decode"](encoded), args.number)
+            trip_us = per_call_us(lambda: round_trip(fmt, body), args.number)
+            print(f"{name:<32}{fmt_name:<9}{len(encoded):>10}{encode_us:>12.1f}{decode_us:>12.1f}{trip_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+In-process stand-ins for the six agents and the Cohere chat endpoint.
+
+The stub agents speak the same /run contract as the real ones ({"output", "timings"}) and
+make one HTTP call to the fake Cohere endpoint per LLM step, so the orchestrator's transport,
+resilience and graph code run exactly as in production, minus the network and the model.
+"""
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Dict
+import httpx
+from fastapi import FastAPI, Request
+
+# Steps whose real agent makes an LLM call (claim scrubbing is rule based)
+LLM_STEPS = {"eligibility", "prior_auth", "clinical_doc", "medical_coding", "claim_submission"}
+
+AGENT_HOSTS = {
+    "eligibility": "eligibility_agent",
+    "prior_auth": "prior_auth_agent",
+    "clinical_doc": "clinical_doc_agent",
+    "medical_coding": "medical_coding_agent",
+    "claim_scrubbing": "claim_scrubbing_agent",
+    "claim_submission": "claim_submission_agent",
+}
+
+# Canned outputs, shaped like what the real agents return
+STUB_OUTPUTS = {
+    "eligibility": {"insurance_id": "ABC123456", "plan": "Gold PPO", "copay": "$25", "eligible": True},
+    "prior_auth": {
+        "patient_summary": "55-year-old male with severe right knee osteoarthritis.",
+        "requested_procedure": "Knee Replacement",
+        "justification": "Failed conservative therapy, X-ray confirms severe OA.",
+        "approval_likelihood": 0.9,
+    },
+    "clinical_doc": {
+        "subjective": "Chest tightness and shortness of breath for 2 days.",
+        "objective": "BP 140/90, HR 96, SpO2 94%, mild wheezing.",
+        "assessment": "Asthma exacerbation.",
+        "plan": "Inhaled corticosteroids, chest X-ray, follow up in 1 week.",
+        "icd10_codes": ["J45.901"],
+        "cpt_codes": ["99214", "71046"],
+    },
+    "medical_coding": {"icd10_codes": ["M17.11"], "cpt_codes": ["27447"]},
+    "claim_scrubbing": {"status": "Clean", "issues": [], "procedure": "Knee Replacement"},
+    "claim_submission": {
+        "claim_id": "CLM-0001",
+        "procedure_performed": "Knee Replacement",
+        "codes": ["27447", "M17.11"],
+        "submission_status": "accepted",
+        "tracking_id": "CH-00000001",
+    },
+}
+
+
+def fake_cohere_app(latency_ms: float, jitter_ms: float = 0.0, seed: int = 0) -> FastAPI:
+    """
+    Fake Cohere v2 /chat endpoint that answers after latency_ms (+ uniform jitter).
+    """
+    app = FastAPI(title="Fake Cohere")
+    rng = random.Random(seed)
+
+    @app.post("/v2/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        await asyncio.sleep((latency_ms + rng.uniform(0, jitter_ms)) / 1000)
+        return {
+            "id": "stub",
+            "finish_reason": "COMPLETE",
+            "message": {"role": "assistant", "content": [{"type": "text", "text": json.dumps({"model": body.get("model")})}]},
+        }
+
+    return app
+
+
+def stub_agent_app(step: str, llm_client: httpx.AsyncClient, agent_latency_ms: float) -> FastAPI:
+    """
+    Stub agent: agent_latency_ms of local work, then one LLM call for LLM-backed steps.
+    """
+    app = FastAPI(title=f"Stub {step} agent")
+
+    @app.post("/run")
+    async def run(request: Request):
+        await request.json()
+        started = time.perf_counter()
+        await asyncio.sleep(agent_latency_ms / 1000)
+
+        llm_seconds = 0.0
+        if step in LLM_STEPS:
+            llm_started = time.perf_counter()
+            resp = await llm_client.post("/v2/chat", json={"model": "command-r-plus-08-2024", "messages": []})
+            resp.raise_for_status()
+            llm_seconds = time.perf_counter() - llm_started
+
+        return {
+            "message": "Run successfully",
+            "output": STUB_OUTPUTS[step],
+            "timings": {"run_seconds": round(time.perf_counter() - started, 4), "llm_seconds": round(llm_seconds, 4)},
+        }
+
+    return app
+
+
+class AgentRouter(httpx.AsyncBaseTransport):
+    """
+    httpx transport that routes each agent host (eligibility_agent, ...) to its in-process app.
+    """
+
+    def __init__(self, apps_by_host: Dict[str, FastAPI]):
+        self.transports = {host: httpx.ASGITransport(app=app) for host, app in apps_by_host.items()}
+        # Calls routed to each host, and hosts that answer 400 (not retried) instead of running
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.failing = set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self.transports.get(request.url.host)
+        if transport is None:
+            raise httpx.ConnectError(f"No stub agent for host {request.url.host}", request=request)
+        self.calls[request.url.host] += 1
+        if request.url.host in self.failing:
+            return httpx.Response(400, json={"detail": "Stub failure"}, request=request)
+        return await transport.handle_async_request(request)
+
+
+def build_stub_agents(llm_latency_ms: float, llm_jitter_ms: float, agent_latency_ms: float, seed: int = 0):
+    """
+    Returns:
+        (AgentRouter for the orchestrator's agent transport, the shared fake-LLM client to close afterwards)
+    """
+    llm_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake_cohere_app(llm_latency_ms, llm_jitter_ms, seed)),
+        base_url="http://fake-cohere",
+    )
+    apps = {host: stub_agent_app(step, llm_client, agent_latency_ms) for step, host in AGENT_HOSTS.items()}
+    return AgentRouter(apps), llm_client
@@ -0,0 +1,124 @@
+"""
+Admission control for workflow runs.
+
+Each workflow_type has a limit on runs in flight and a bounded queue of admitted runs
+waiting for a slot. When both are full new runs are rejected with 429 + Retry-After,
+instead of piling more load onto the agents and Postgres.
+"""
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any
+
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", os.getenv("WORKFLOW_WORKERS", "32")))
+DEFAULT_MAX_QUEUED = int(os.getenv("ADMISSION_MAX_QUEUED", "200"))
+
+
+def parse_limits(value: str) -> Dict[str, int]:
+    """
+    Parse per-workflow_type overrides, e.g. "full=8,eligibility_only=64".
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        workflow_type, limit = item.split("=")
+        limits[workflow_type.strip()] = int(limit)
+    return limits
+
+
+ADMISSION_LIMITS = parse_limits(os.getenv("ADMISSION_LIMITS", ""))
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, workflow_type: str, retry_after: int):
+        super().__init__(f"Too many {workflow_type} workflows in progress, retry in {retry_after}s")
+        self.workflow_type = workflow_type
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, limits: Dict[str, int] = ADMISSION_LIMITS, max_queued: int = DEFAULT_MAX_QUEUED):
+        self.limits = dict(limits)
+        self.max_queued = max_queued
+        self.in_flight: Dict[str, int] = {}
+        self.waiting: Dict[str, int] = {}
+        self.avg_duration: Dict[str, float] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def limit(self, workflow_type: str) -> int:
+        return self.limits.get(workflow_type, DEFAULT_MAX_IN_FLIGHT)
+
+    def _semaphore(self, workflow_type: str) -> asyncio.Semaphore:
+        if workflow_type not in self._semaphores:
+            self._semaphores[workflow_type] = asyncio.Semaphore(self.limit(workflow_type))
+        return self._semaphores[workflow_type]
+
+    def retry_after(self, workflow_type: str) -> int:
+        """
+        Rough time until a queue position frees up, from the average run duration.
+        """
+        avg = self.avg_duration.get(workflow_type, 5.0)
+        return max(1, min(300, math.ceil(avg * (self.waiting.get(workflow_type, 0) + 1) / self.limit(workflow_type))))
+
+    def admit(self, workflow_type: str, bounded: bool = True):
+        """
+        Reserve a place for a run. The reservation is consumed by slot() or returned with release().
+
+        Args:
+            bounded (bool): Enforce the queue bound. Batches pass False, they bound themselves.
+
+        Raises:
+            AdmissionRejected: If all slots are busy and the wait queue is full.
+        """
+        waiting = self.waiting.get(workflow_type, 0)
+        in_flight = self.in_flight.get(workflow_type, 0)
+        if bounded and in_flight >= self.limit(workflow_type) and waiting >= self.max_queued:
+            raise AdmissionRejected(workflow_type, self.retry_after(workflow_type))
+        self.waiting[workflow_type] = waiting + 1
+
+    def release(self, workflow_type: str):
+        """
+        Return the reservation of an admitted run that will not be started.
+        """
+        self.waiting[workflow_type] -= 1
+
+    @asynccontextmanager
+    async def slot(self, workflow_type: str):
+        """
+        Wait for an in-flight slot for an admitted run and hold it while the run executes.
+        """
+        semaphore = self._semaphore(workflow_type)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting[workflow_type] -= 1
+
+        self.in_flight[workflow_type] = self.in_flight.get(workflow_type, 0) + 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight[workflow_type] -= 1
+            semaphore.release()
+            duration = time.monotonic() - started
+            previous = self.avg_duration.get(workflow_type)
+            self.avg_duration[workflow_type] = duration if previous is None else 0.8 * previous + 0.2 * duration
+
+    def stats(self) -> Dict[str, Any]:
+        workflow_types = set(self.limits) | set(self.in_flight) | set(self.waiting)
+        return {
+            "max_queued": self.max_queued,
+            "workflow_types": {
+                workflow_type: {
+                    "limit": self.limit(workflow_type),
+                    "in_flight": self.in_flight.get(workflow_type, 0),
+                    "queued": self.waiting.get(workflow_type, 0),
+                    "avg_duration_seconds": round(self.avg_duration.get(workflow_type, 0.0), 3),
+                }
+                for workflow_type in sorted(workflow_types)
+            },
+        }
+
+
+admission = AdmissionController()
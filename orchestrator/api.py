@@ -1,16 +1,31 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, Request
+import datetime
+from typing import List, Optional
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 import os
-import shutil
-from pathlib import Path
-from main import rcm_pipeline
-from database import Base, engine, SessionLocal
+import tarfile
+import zipfile
+from main import create_workflow_run, submit_workflow, task_registry, get_workflow_snapshot, active_workflows
+from checkpoints import open_checkpointer, close_checkpointer
+from transport import agent_transport
+from workflows import WORKFLOW_STEPS, precompile_workflows
+from uploads import store_upload
+from pagination import PageParams, paginate, NEXT_CURSOR_HEADER
+from events import workflow_events, format_sse
+from admission import admission, AdmissionRejected
+from metrics import metrics_response
+from batches import Batch, BATCH_CONCURRENCY, batches, evict_batches, store_batch_files, submit_batch
+from summary import read_summary
+from cache import response_cache
+from export import EXPORT_FORMATS, EXPORT_TABLES, export_query, stream_export
+from archive import ARCHIVE_TABLE_NAMES, MONTH_PATTERN, archived_months, month_dir, read_archive, read_manifest
+from database import SessionLocal
 from sqlalchemy.orm import Session
 import models
 
-# Create tables at startup
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (migrations/), run `alembic upgrade head` before starting
 
 # initialize FastAPI app
 app = FastAPI(title="RCM interface", version="1.0.0")
@@ -25,8 +40,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+@app.on_event("startup")
+def compile_workflows():
+    precompile_workflows(task_registry())
+
+@app.on_event("startup")
+async def start_checkpointer():
+    await open_checkpointer()
+
+@app.on_event("shutdown")
+async def close_agent_transport():
+    await agent_transport.aclose()
+    await close_checkpointer()
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -35,9 +64,14 @@ def get_db():
     finally:
         db.close()
 
-# Ensure upload directory exists
-UPLOAD_DIR = Path("/uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+def admit_or_429(workflow_type: str):
+    """
+    Reserve an admission slot for a run, or answer 429 with Retry-After when the workflow_type is saturated.
+    """
+    try:
+        admission.admit(workflow_type)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
 # Define the API endpoints
 @app.post("/run")
@@ -49,190 +83,521 @@ async def run(workflow_type: str = Form(...), file: UploadFile = File(...), db:
 
     Currently it is the only one that requires an upload.
 
+    The run is recorded and handed to the background worker pool, the
+    response returns straight away with the workflow_id to poll.
+    Answers 429 with Retry-After when the workflow_type's in-flight limit
+    and wait queue are both full.
+
     Args:
         workflow_type (str): Type of workflow to run
         file (UploadFile): Uploaded file to process
         
     Returns:
-        JSONResponse: Result of the workflow execution
+        JSONResponse: workflow_id and thread_id of the queued run
     """
 
-    # Save uploaded file
-    file_path = UPLOAD_DIR / file.filename
-    
-    try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
-    
-
-    if workflow_type == "eligibility_only":
-        steps = ["eligibility"]
-    elif workflow_type == "clinical_doc_only":
-        steps = ["clinical_doc"]
-    elif workflow_type == "prior_auth_only":
-        steps = ["prior_auth"]
-    elif workflow_type == "pre_auth_clinical_doc":
-        steps = [
-            "eligibility",
-            "prior_auth",
-            "clinical_doc",
-        ]
-    elif workflow_type == "full":
-        steps = [
-            "eligibility",
-            "clinical_doc",
-            "prior_auth",
-            "medical_coding",
-            "claim_scrubbing",
-            "claim_submission",
-        ]
-    else:
+    steps = WORKFLOW_STEPS.get(workflow_type)
+    if steps is None:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid workflow type: {workflow_type}"
         )
 
-    result = rcm_pipeline(db=db, steps=steps, workflow_type="full", file_path=str(file_path))
+    # Reject before doing any work if this workflow_type is saturated
+    admit_or_429(workflow_type)
 
+    # Save uploaded file, identical uploads share one blob
     try:
-        return JSONResponse(
-            status_code=200,
-            content={
-                "message": "Run successfully",
-                "final_state": result
-            }
-        )
-        
+        file_path = await store_upload(file)
+        state = await run_in_threadpool(create_workflow_run, workflow_type=workflow_type, file_path=str(file_path), db=db)
     except Exception as e:
+        admission.release(workflow_type)
+        raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
+
+    submit_workflow(steps=steps, state=state)
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "message": "Run accepted",
+            "workflow_id": state["workflow_id"],
+            "thread_id": state["thread_id"],
+        }
+    )
+
+@app.post("/batches")
+async def run_batch(
+    workflow_type: str = Form(...),
+    files: List[UploadFile] = File(...),
+    concurrency: int = Form(BATCH_CONCURRENCY),
+    db: Session = Depends(get_db),
+):
+    """
+    Kick off one workflow run per uploaded file.
+
+    Zip and tar archives are expanded, each file inside becomes its own run.
+    At most `concurrency` runs of the batch execute at once.
+
+    Args:
+        workflow_type (str): Type of workflow to run for every file
+        files (List[UploadFile]): Files and/or archives to process
+        concurrency (int): Maximum runs of this batch in flight
+        
+    Returns:
+        JSONResponse: batch_id, progress summary and the workflow_id of every item
+    """
+    steps = WORKFLOW_STEPS.get(workflow_type)
+    if steps is None:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to upload file: {str(e)}"
+            status_code=400,
+            detail=f"Invalid workflow type: {workflow_type}"
         )
 
+    try:
+        stored = await run_in_threadpool(store_batch_files, files)
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid archive: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error saving files: {str(e)}")
+
+    if not stored:
+        raise HTTPException(status_code=400, detail="Batch contains no files")
+
+    batch = Batch(workflow_type=workflow_type, concurrency=max(1, concurrency))
+    states = []
+
+    def record_items():
+        for filename, file_path in stored:
+            state = create_workflow_run(workflow_type=workflow_type, file_path=str(file_path), db=db)
+            batch.add_item(filename, state)
+            states.append(state)
+
+    await run_in_threadpool(record_items)
+    submit_batch(batch, steps, states)
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "message": "Batch accepted",
+            **batch.summary(),
+            "workflow_ids": [state["workflow_id"] for state in states],
+        }
+    )
+
+@app.get("/batches/{batch_id}")
+def get_batch(batch_id: str):
+    """
+    Retrieve progress of a batch and the status of each of its items.
+    Args:
+        batch_id (str): Id returned by /batches.
+    Returns:
+        Batch summary with per-item status. Batches are kept in memory, so finished ones
+        expire (BATCH_TTL, BATCH_HISTORY) and none survive an orchestrator restart.
+    """
+    evict_batches()
+    batch = batches.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Batch not found: {batch_id}")
+    return {**batch.summary(), "items": list(batch.items.values())}
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Prometheus metrics: step/workflow latency, payload sizes and LLM time per step.
+    """
+    return metrics_response()
+
+@app.get("/admission")
+def get_admission():
+    """
+    In-flight runs and queue depth per workflow_type, for sizing replicas.
+    Returns:
+        Admission limits and current counts.
+    """
+    return admission.stats()
+
 @app.get("/workflows")
-def get_workflows(db: Session = Depends(get_db)):
+def get_workflows(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all workflow runs from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of workflow runs.
+        List of workflow runs, one page at a time, served from the response cache when fresh.
     """
-    workflows = db.query(models.WorkflowRun).all()
-    return workflows
+    return response_cache.read_through(
+        request, [models.WorkflowRun.__tablename__],
+        lambda response: paginate(db.query(models.WorkflowRun), models.WorkflowRun, page, response),
+    )
+
+def find_workflow(workflow_id: str, db: Session) -> models.WorkflowRun:
+    """
+    Look up a workflow run, or answer 404.
+    """
+    workflow = (
+        db.query(models.WorkflowRun)
+        .filter(models.WorkflowRun.workflow_id == workflow_id)
+        .first()
+    )
+    if workflow is None:
+        raise HTTPException(status_code=404, detail=f"Workflow not found: {workflow_id}")
+    return workflow
+
+@app.get("/workflows/{workflow_id}")
+def get_workflow(workflow_id: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Retrieve the status of a single workflow run.
+    Args:
+        workflow_id (str): Id returned by /run.
+        db (Session): Database session dependency.
+    Returns:
+        The workflow run, served from the response cache when fresh.
+    """
+    return response_cache.read_through(
+        request, [models.WorkflowRun.__tablename__],
+        lambda response: find_workflow(workflow_id, db),
+    )
+
+# Artifacts returned by /workflows/{workflow_id}/full, each looked up by its indexed workflow_run_id
+WORKFLOW_ARTIFACTS = {
+    "step_timings": models.WorkflowStepTiming,
+    "eligibility_checks": models.EligibilityCheck,
+    "prior_auths": models.PriorAuth,
+    "clinical_documents": models.ClinicalDocument,
+    "claims_scrubbing": models.ClaimsScrubbing,
+    "claims": models.Claim,
+    "resubmissions": models.Resubmission,
+    "denials": models.Denial,
+    "payments": models.Payment,
+    "reconciliations": models.Reconciliation,
+}
+
+@app.get("/workflows/{workflow_id}/full")
+def get_workflow_full(workflow_id: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Retrieve a workflow run together with everything its steps recorded, so a detail view
+    does not have to page through every artifact list and join them client-side.
+    Args:
+        workflow_id (str): Id returned by /run.
+        db (Session): Database session dependency.
+    Returns:
+        The workflow run with one list per artifact type, oldest first, served from the
+        response cache when fresh.
+    """
+    def load(response):
+        workflow = find_workflow(workflow_id, db)
+        artifacts = {
+            name: db.query(model).filter(model.workflow_run_id == workflow_id).order_by(model.id).all()
+            for name, model in WORKFLOW_ARTIFACTS.items()
+        }
+        return {"workflow": workflow, **artifacts}
+
+    tables = [models.WorkflowRun.__tablename__] + [model.__tablename__ for model in WORKFLOW_ARTIFACTS.values()]
+    return response_cache.read_through(request, tables, load)
+
+@app.get("/workflows/{workflow_id}/events")
+async def get_workflow_events(workflow_id: str, db: Session = Depends(get_db)):
+    """
+    Stream progress of a workflow run as Server-Sent Events.
+
+    Emits workflow-started, step-started, step-finished (with latency_ms), step-failed
+    (with error), and a final workflow-completed or workflow-failed event that ends the stream.
+    Args:
+        workflow_id (str): Id returned by /run.
+        db (Session): Database session dependency.
+    Returns:
+        StreamingResponse: text/event-stream
+    """
+    if not workflow_events.has_history(workflow_id):
+        workflow = await run_in_threadpool(find_workflow, workflow_id, db)
+
+        # Finished before this process saw it (e.g. a restart): report the final status only
+        if workflow.status in ("completed", "failed"):
+            event = "workflow-completed" if workflow.status == "completed" else "workflow-failed"
+            message = {"event": event, "workflow_id": workflow_id, "error": workflow.error_message}
+            return StreamingResponse(iter([format_sse(message)]), media_type="text/event-stream")
+
+    async def stream():
+        async for message in workflow_events.subscribe(workflow_id):
+            yield format_sse(message)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/workflows/{workflow_id}/resume")
+async def resume_workflow(workflow_id: str, db: Session = Depends(get_db)):
+    """
+    Resume a failed or interrupted workflow run from its last checkpoint.
+
+    Steps that already completed are not re-run.
+    Args:
+        workflow_id (str): Id returned by /run.
+        db (Session): Database session dependency.
+    Returns:
+        JSONResponse: workflow_id and the steps that will be run
+    """
+    workflow = await run_in_threadpool(find_workflow, workflow_id, db)
+
+    if workflow.status == "completed":
+        raise HTTPException(status_code=409, detail=f"Workflow already completed: {workflow_id}")
+    if workflow_id in active_workflows:
+        raise HTTPException(status_code=409, detail=f"Workflow is still running: {workflow_id}")
+
+    steps = WORKFLOW_STEPS.get(workflow.workflow_type)
+    if steps is None:
+        raise HTTPException(status_code=409, detail=f"Unknown workflow type: {workflow.workflow_type}")
+
+    snapshot = await get_workflow_snapshot(steps, workflow.thread_id)
+    if not snapshot.next:
+        raise HTTPException(status_code=409, detail=f"No checkpoint to resume for workflow: {workflow_id}")
+
+    admit_or_429(workflow.workflow_type)
+    submit_workflow(
+        steps=steps,
+        state={"workflow_id": workflow.workflow_id, "thread_id": workflow.thread_id, "workflow_type": workflow.workflow_type},
+        resume=True,
+    )
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "message": "Resume accepted",
+            "workflow_id": workflow.workflow_id,
+            "next_steps": list(snapshot.next),
+            "retry_count": snapshot.values.get("retry_count", 0) + 1,
+        }
+    )
+
+@app.get("/summary")
+def get_summary(request: Request, db: Session = Depends(get_db)):
+    """
+    Counts for the dashboard home page: eligible vs. not, claims by status and submission
+    status, scrub results and the other artifacts by status.
+    Args:
+        db (Session): Database session dependency.
+    Returns:
+        Counts per "<table>.<column>" metric and value, kept up to date by the agents.
+    """
+    return response_cache.read_through(
+        request, [models.SummaryCounter.__tablename__],
+        lambda response: read_summary(db),
+    )
 
 @app.get("/eligibility_checks")
-def get_eligibility_checks(db: Session = Depends(get_db)):
+def get_eligibility_checks(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all eligibility checks from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of eligibility checks.
+        List of eligibility checks, one page at a time, served from the response cache when fresh.
     """
-    eligibility_checks = db.query(models.EligibilityCheck).all()
-    return eligibility_checks
+    return response_cache.read_through(
+        request, [models.EligibilityCheck.__tablename__],
+        lambda response: paginate(db.query(models.EligibilityCheck), models.EligibilityCheck, page, response),
+    )
 
 @app.get("/prior_auths")
-def get_prior_auths(db: Session = Depends(get_db)):
+def get_prior_auths(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all prior authorizations from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of prior authorizations.
+        List of prior authorizations, one page at a time, served from the response cache when fresh.
     """
-    prior_auths = db.query(models.PriorAuth).all()
-    return prior_auths
+    return response_cache.read_through(
+        request, [models.PriorAuth.__tablename__],
+        lambda response: paginate(db.query(models.PriorAuth), models.PriorAuth, page, response),
+    )
 
 @app.get("/clinical_documents")
-def get_clinical_documents(db: Session = Depends(get_db)):
+def get_clinical_documents(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all clinical documents from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of clinical documents.
+        List of clinical documents, one page at a time, served from the response cache when fresh.
     """
-    clinical_documents = db.query(models.ClinicalDocument).all()
-    return clinical_documents
+    return response_cache.read_through(
+        request, [models.ClinicalDocument.__tablename__],
+        lambda response: paginate(db.query(models.ClinicalDocument), models.ClinicalDocument, page, response),
+    )
 
 @app.get("/coded_encounters")
-def get_coded_encounters(db: Session = Depends(get_db)):
+def get_coded_encounters(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all coded encounters from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of coded encounters.
+        List of coded encounters, one page at a time, served from the response cache when fresh.
     """
-    coded_encounters = db.query(models.ClinicalDocument).all()
-    return coded_encounters
+    return response_cache.read_through(
+        request, [models.ClinicalDocument.__tablename__],
+        lambda response: paginate(db.query(models.ClinicalDocument), models.ClinicalDocument, page, response),
+    )
 
 
 @app.get("/claims_scrubbing")
-def get_claims_scrubbing(db: Session = Depends(get_db)):
+def get_claims_scrubbing(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all claims scrubbing from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of claims scrubbing.
+        List of claims scrubbing, one page at a time, served from the response cache when fresh.
     """
-    claims_scrubbing = db.query(models.ClaimsScrubbing).all()
-    return claims_scrubbing
+    return response_cache.read_through(
+        request, [models.ClaimsScrubbing.__tablename__],
+        lambda response: paginate(db.query(models.ClaimsScrubbing), models.ClaimsScrubbing, page, response),
+    )
 
 @app.get("/claims")
-def get_claims(db: Session = Depends(get_db)):
+def get_claims(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all claims from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of claims.
+        List of claims, one page at a time, served from the response cache when fresh.
     """
-    claims = db.query(models.Claim).all()
-    return claims
+    return response_cache.read_through(
+        request, [models.Claim.__tablename__],
+        lambda response: paginate(db.query(models.Claim), models.Claim, page, response),
+    )
 
 @app.get("/denials")
-def get_denials(db: Session = Depends(get_db)):
+def get_denials(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all denials from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of denials.
+        List of denials, one page at a time, served from the response cache when fresh.
     """
-    denials = db.query(models.Denial).all()
-    return denials
+    return response_cache.read_through(
+        request, [models.Denial.__tablename__],
+        lambda response: paginate(db.query(models.Denial), models.Denial, page, response),
+    )
 
 @app.get("/payments")
-def get_payments(db: Session = Depends(get_db)):
+def get_payments(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all payments from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of payments.
+        List of payments, one page at a time, served from the response cache when fresh.
     """
-    payments = db.query(models.Payment).all()
-    return payments
+    return response_cache.read_through(
+        request, [models.Payment.__tablename__],
+        lambda response: paginate(db.query(models.Payment), models.Payment, page, response),
+    )
 
 @app.get("/reconciliations")
-def get_reconciliations(db: Session = Depends(get_db)):
+def get_reconciliations(request: Request, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     Retrieve all reconciliations from the database.
     Args:
+        page (PageParams): Page size, keyset cursor, sort and filters.
         db (Session): Database session dependency.
     Returns:
-        List of reconciliations.
+        List of reconciliations, one page at a time, served from the response cache when fresh.
+    """
+    return response_cache.read_through(
+        request, [models.Reconciliation.__tablename__],
+        lambda response: paginate(db.query(models.Reconciliation), models.Reconciliation, page, response),
+    )
+
+@app.get("/exports/{table}")
+def export_table(
+    table: str,
+    format: str = "ndjson",
+    status: Optional[str] = None,
+    workflow_run_id: Optional[str] = None,
+    patient_id: Optional[str] = None,
+    created_after: Optional[datetime.datetime] = None,
+    created_before: Optional[datetime.datetime] = None,
+):
+    """
+    Stream every matching row of an artifact table (claims, claims_scrubbing, ...) as NDJSON
+    or CSV, for reconciliation and billing exports of any size.
+    Args:
+        table (str): Table to export, one of EXPORT_TABLES.
+        format (str): ndjson (default) or csv.
+        status, workflow_run_id, patient_id: Optional filters, where the table has the column.
+        created_after, created_before: Optional created_at range, [after, before).
+    Returns:
+        StreamingResponse: The rows ordered by id, sent as they are read.
     """
-    reconciliations = db.query(models.Reconciliation).all()
-    return reconciliations
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {table}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}")
+
+    query = export_query(
+        table,
+        {"status": status, "workflow_run_id": workflow_run_id, "patient_id": patient_id},
+        created_after=created_after,
+        created_before=created_before,
+    )
+    return StreamingResponse(
+        stream_export(query, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
 
 
+@app.get("/archive")
+def get_archive():
+    """
+    List the archived months and how many rows of each table they hold.
+    Returns:
+        List of archive manifests, oldest month first.
+    """
+    return [read_manifest(month) for month in archived_months()]
+
+@app.get("/archive/{month}/{table}")
+def get_archived_rows(
+    month: str,
+    table: str,
+    status: Optional[str] = None,
+    workflow_run_id: Optional[str] = None,
+    patient_id: Optional[str] = None,
+):
+    """
+    Stream archived rows of one table and month (runs moved out of Postgres by archive.py)
+    as NDJSON, decompressed on the fly.
+    Args:
+        month (str): YYYY-MM.
+        table (str): Archived table, e.g. claims or workflow_runs.
+        status, workflow_run_id, patient_id: Optional filters on the archived rows.
+    Returns:
+        StreamingResponse: application/x-ndjson
+    """
+    if not MONTH_PATTERN.match(month) or table not in ARCHIVE_TABLE_NAMES:
+        raise HTTPException(status_code=404, detail=f"No archive for {table} in {month}")
+    if not (month_dir(month) / f"{table}.ndjson.gz").exists():
+        raise HTTPException(status_code=404, detail=f"No archive for {table} in {month}")
+    return StreamingResponse(
+        read_archive(month, table, {"status": status, "workflow_run_id": workflow_run_id, "patient_id": patient_id}),
+        media_type=EXPORT_FORMATS["ndjson"],
+    )
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,290 @@
+"""
+Monthly archival of workflow runs and their artifacts.
+
+A month is archived by moving every workflow run created in it (UTC), together with all of
+the rows its steps recorded, out of Postgres into gzip-compressed NDJSON files:
+
+    ARCHIVE_DIR/<YYYY-MM>/<table>.ndjson.gz
+    ARCHIVE_DIR/<YYYY-MM>/manifest.json    row counts and dashboard summary counts
+
+The rows are read and deleted in one REPEATABLE READ transaction, so exactly the rows
+written to the files are removed and anything committed meanwhile stays in the hot tables.
+Runs move with all of their artifacts, and so does every artifact of a later run that
+references an archived one (e.g. a denial of an archived claim), which keeps the foreign keys
+between them intact.
+Archived months stay queryable through GET /archive/{month}/{table}, and their counts stay
+in the dashboard summary.
+
+Run it once a month, e.g. from cron:
+    python archive.py run             # every full month older than ARCHIVE_AFTER_MONTHS
+    python archive.py month 2025-01   # one month
+"""
+import argparse
+import datetime
+import gzip
+import json
+import os
+import re
+import shutil
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import func, select
+from database import engine
+from cache import response_cache
+from export import ndjson_chunk
+import models
+
+ARCHIVE_DIR = Path(os.getenv("ARCHIVE_DIR", "archive"))
+# Months kept in the hot tables, not counting the current one
+ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "6"))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "5000"))
+ARCHIVE_COMPRESSLEVEL = int(os.getenv("ARCHIVE_COMPRESSLEVEL", "6"))
+
+# Deletion order: rows before the rows they reference
+ARCHIVE_TABLES = [
+    models.Reconciliation,
+    models.Denial,
+    models.Payment,
+    models.Resubmission,
+    models.Claim,
+    models.ClaimsScrubbing,
+    models.ClinicalDocument,
+    models.PriorAuth,
+    models.EligibilityCheck,
+    models.WorkflowStepTiming,
+    models.WorkflowRun,
+]
+ARCHIVE_MODELS = {model.__tablename__: model for model in ARCHIVE_TABLES}
+ARCHIVE_TABLE_NAMES = set(ARCHIVE_MODELS)
+
+MONTH_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+def parse_month(month: str) -> datetime.datetime:
+    """
+    Returns:
+        datetime: First instant of month ("YYYY-MM") in UTC.
+    """
+    if not MONTH_PATTERN.match(month):
+        raise ValueError(f"Invalid month, expected YYYY-MM: {month}")
+    year, number = map(int, month.split("-"))
+    return datetime.datetime(year, number, 1, tzinfo=datetime.timezone.utc)
+
+
+def add_months(start: datetime.datetime, months: int) -> datetime.datetime:
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def month_dir(month: str) -> Path:
+    return ARCHIVE_DIR / month
+
+
+def archived_months() -> List[str]:
+    if not ARCHIVE_DIR.exists():
+        return []
+    return sorted(path.parent.name for path in ARCHIVE_DIR.glob("*/manifest.json") if MONTH_PATTERN.match(path.parent.name))
+
+
+def read_manifest(month: str) -> Optional[Dict[str, Any]]:
+    path = month_dir(month) / "manifest.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def month_condition(model, start: datetime.datetime, end: datetime.datetime):
+    """
+    Rows of model that belong to runs created in [start, end), plus the rows of any run that
+    reference an archived artifact: a later run's denial or payment of an archived claim
+    goes with the claim, otherwise deleting the claim would break its foreign key.
+    """
+    runs = models.WorkflowRun.__table__
+    in_month = (runs.c.created_at >= start) & (runs.c.created_at < end)
+    if model is models.WorkflowRun:
+        return in_month
+    table = model.__table__
+    condition = table.c.workflow_run_id.in_(select(runs.c.workflow_id).where(in_month))
+    for foreign_key in table.foreign_keys:
+        referenced = foreign_key.column.table
+        if referenced is runs:
+            continue
+        referenced_model = ARCHIVE_MODELS[referenced.name]
+        condition = condition | foreign_key.parent.in_(
+            select(foreign_key.column).where(month_condition(referenced_model, start, end))
+        )
+    return condition
+
+
+def write_table(conn, model, condition, path: Path, summary: Counter) -> int:
+    """
+    Append the rows of model matching condition to the gzip file at path, chunk by chunk.
+    Returns:
+        int: Rows written.
+    """
+    table_name = model.__tablename__
+    counted = [column for table, column in models.SUMMARY_COUNTERS if table == table_name]
+    result = conn.execute(select(model.__table__).where(condition).execution_options(yield_per=ARCHIVE_CHUNK_SIZE))
+    columns = list(result.keys())
+    count = 0
+    # Appending adds a gzip member, readers see one continuous stream
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab", compresslevel=ARCHIVE_COMPRESSLEVEL) as out:
+            for rows in result.partitions():
+                out.write(ndjson_chunk(columns, rows).encode())
+                count += len(rows)
+                for column in counted:
+                    position = columns.index(column)
+                    summary.update((f"{table_name}.{column}", models.summary_value(row[position])) for row in rows)
+        # The rows are deleted once this returns, the file must be on disk
+        raw.flush()
+        os.fsync(raw.fileno())
+    return count
+
+
+def archive_month(month: str) -> Dict[str, Any]:
+    """
+    Move one month of runs and artifacts from Postgres to ARCHIVE_DIR/<month>.
+
+    Archiving a month again (runs created late, or a failed attempt) adds the remaining rows
+    to its files.
+    Returns:
+        dict: The month's manifest.
+    """
+    start = parse_month(month)
+    end = add_months(start, 1)
+    target = month_dir(month)
+    staging = ARCHIVE_DIR / f".{month}.tmp"
+    backup = ARCHIVE_DIR / f".{month}.old"
+    shutil.rmtree(staging, ignore_errors=True)
+    shutil.rmtree(backup, ignore_errors=True)
+    if target.exists():
+        shutil.copytree(target, staging)
+    else:
+        staging.mkdir(parents=True)
+
+    manifest = read_manifest(month) or {"month": month, "rows": {}, "summary": {}}
+    summary = Counter()
+    for metric, values in manifest["summary"].items():
+        for value, count in values.items():
+            summary[(metric, value)] += count
+
+    swapped = False
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            conn = conn.execution_options(isolation_level="REPEATABLE READ")
+        transaction = conn.begin()
+        try:
+            for model in ARCHIVE_TABLES:
+                table_name = model.__tablename__
+                path = staging / f"{table_name}.ndjson.gz"
+                count = write_table(conn, model, month_condition(model, start, end), path, summary)
+                manifest["rows"][table_name] = manifest["rows"].get(table_name, 0) + count
+
+            for model in ARCHIVE_TABLES:
+                conn.execute(model.__table__.delete().where(month_condition(model, start, end)))
+
+            manifest["archived_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            manifest["summary"] = {}
+            for (metric, value), count in sorted(summary.items()):
+                manifest["summary"].setdefault(metric, {})[value] = count
+            with open(staging / "manifest.json", "w") as f:
+                f.write(json.dumps(manifest, indent=2))
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Files are in place before the rows are gone; if the commit fails the previous
+            # files are put back and the rows are still in Postgres
+            if target.exists():
+                target.rename(backup)
+            staging.rename(target)
+            swapped = True
+            transaction.commit()
+        except BaseException:
+            transaction.rollback()
+            if swapped:
+                shutil.rmtree(target, ignore_errors=True)
+                if backup.exists():
+                    backup.rename(target)
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    shutil.rmtree(backup, ignore_errors=True)
+    response_cache.invalidate(ARCHIVE_TABLE_NAMES)
+    print(f"Archived {month}:", manifest["rows"])
+    return manifest
+
+
+def months_to_archive(now: Optional[datetime.datetime] = None) -> List[str]:
+    """
+    Returns:
+        list: Months ("YYYY-MM") with runs still in Postgres that are older than
+        ARCHIVE_AFTER_MONTHS full months.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    cutoff = add_months(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), -ARCHIVE_AFTER_MONTHS)
+    created_at = models.WorkflowRun.created_at
+    months = []
+    with engine.connect() as conn:
+        # One index lookup per month that has runs, empty months are skipped
+        oldest = conn.execute(select(func.min(created_at)).where(created_at < cutoff)).scalar()
+        while oldest is not None:
+            if oldest.tzinfo is None:
+                oldest = oldest.replace(tzinfo=datetime.timezone.utc)
+            month = oldest.astimezone(datetime.timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            months.append(month.strftime("%Y-%m"))
+            oldest = conn.execute(
+                select(func.min(created_at)).where(created_at >= add_months(month, 1), created_at < cutoff)
+            ).scalar()
+    return months
+
+
+def read_archive(month: str, table: str, filters: Dict[str, Optional[str]]) -> Iterator[bytes]:
+    """
+    Stream the archived rows of table for month as NDJSON, keeping those whose fields equal
+    every filter that is set.
+    """
+    path = month_dir(month) / f"{table}.ndjson.gz"
+    filters = {column: value for column, value in filters.items() if value is not None}
+    chunk = []
+    with gzip.open(path, "rt") as archived:
+        for line in archived:
+            if filters:
+                row = json.loads(line)
+                if any(str(row.get(column)) != value for column, value in filters.items()):
+                    continue
+            chunk.append(line)
+            if len(chunk) >= ARCHIVE_CHUNK_SIZE:
+                yield "".join(chunk).encode()
+                chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
+
+
+def archived_summary() -> Counter:
+    """
+    Returns:
+        Counter: (metric, value) -> count over every archived month, for the dashboard summary.
+    """
+    summary = Counter()
+    for month in archived_months():
+        for metric, values in read_manifest(month)["summary"].items():
+            for value, count in values.items():
+                summary[(metric, value)] += count
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old workflow runs and artifacts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("run", help=f"Archive every month older than ARCHIVE_AFTER_MONTHS ({ARCHIVE_AFTER_MONTHS})")
+    month_parser = subparsers.add_parser("month", help="Archive one month")
+    month_parser.add_argument("month", help="YYYY-MM")
+    args = parser.parse_args()
+
+    months = months_to_archive() if args.command == "run" else [args.month]
+    for month in months:
+        archive_month(month)
+    if not months:
+        print("Nothing to archive")
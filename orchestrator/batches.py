@@ -0,0 +1,151 @@
+"""
+Batch submission: many uploads (or zip/tar archives of them) run through one workflow_type
+with a bounded number of runs in flight.
+
+Batch progress is tracked in process only, so the status of every batch is lost when the
+orchestrator restarts; each item is also a normal workflow_runs row, which is not. Finished
+batches are forgotten BATCH_TTL seconds after they finish, or sooner (oldest first) once more
+than BATCH_HISTORY batches are tracked. Running batches are never dropped.
+"""
+import asyncio
+import os
+import tarfile
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+from fastapi import UploadFile
+from uploads import store_blob
+from main import submit_workflow, background_runs
+from admission import admission
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+BATCH_TTL = float(os.getenv("BATCH_TTL", "86400"))
+BATCH_HISTORY = int(os.getenv("BATCH_HISTORY", "1000"))
+
+# Oldest submitted first
+batches: "OrderedDict[str, Batch]" = OrderedDict()
+
+
+class Batch:
+    def __init__(self, workflow_type: str, concurrency: int):
+        self.batch_id = str(uuid.uuid4())
+        self.workflow_type = workflow_type
+        self.concurrency = concurrency
+        self.created_at = time.time()
+        self.finished_at = None
+        self.items: Dict[str, Dict[str, Any]] = {}
+
+    def add_item(self, filename: str, state: Dict[str, Any]):
+        self.items[state["workflow_id"]] = {
+            "workflow_id": state["workflow_id"],
+            "filename": filename,
+            "file_path": state["file_path"],
+            "status": "queued",
+            "started_at": None,
+            "finished_at": None,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for item in self.items.values():
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+
+        total = len(self.items)
+        finished = counts.get("completed", 0) + counts.get("failed", 0)
+        elapsed = (self.finished_at or time.time()) - self.created_at
+
+        return {
+            "batch_id": self.batch_id,
+            "workflow_type": self.workflow_type,
+            "concurrency": self.concurrency,
+            "total": total,
+            "counts": counts,
+            "progress": finished / total if total else 1.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "items_per_minute": round(finished / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            "done": self.finished_at is not None,
+        }
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def store_batch_files(files: List[UploadFile]) -> List[Tuple[str, Path]]:
+    """
+    Store every upload, expanding zip/tar archives into one blob per member file.
+
+    Returns:
+        List of (filename, blob path) pairs.
+    """
+    stored = []
+    for file in files:
+        filename = file.filename or "upload"
+        if not is_archive(filename):
+            stored.append((filename, store_blob(file.file)))
+        elif filename.lower().endswith(".zip"):
+            with zipfile.ZipFile(file.file) as archive:
+                for member in archive.infolist():
+                    if member.is_dir() or Path(member.filename).name.startswith("."):
+                        continue
+                    with archive.open(member) as member_file:
+                        stored.append((member.filename, store_blob(member_file)))
+        else:
+            with tarfile.open(fileobj=file.file, mode="r:*") as archive:
+                for member in archive:
+                    if not member.isfile() or Path(member.name).name.startswith("."):
+                        continue
+                    with archive.extractfile(member) as member_file:
+                        stored.append((member.name, store_blob(member_file)))
+    return stored
+
+
+async def run_batch(batch: Batch, steps, states: List[Dict[str, Any]]):
+    """
+    Run every item of a batch, at most batch.concurrency at a time.
+    """
+    semaphore = asyncio.Semaphore(batch.concurrency)
+
+    async def run_item(state):
+        item = batch.items[state["workflow_id"]]
+        async with semaphore:
+            item["status"] = "running"
+            item["started_at"] = time.time()
+            # The batch already bounds its own concurrency, so it skips the queue bound
+            admission.admit(batch.workflow_type, bounded=False)
+            result = await submit_workflow(steps=steps, state=state)
+            item["status"] = "completed" if result is not None else "failed"
+            item["finished_at"] = time.time()
+
+    await asyncio.gather(*(run_item(state) for state in states))
+    batch.finished_at = time.time()
+
+
+def evict_batches():
+    """
+    Drop finished batches older than BATCH_TTL, then the oldest finished ones while more
+    than BATCH_HISTORY batches are tracked.
+    """
+    cutoff = time.time() - BATCH_TTL
+    finished = [batch for batch in batches.values() if batch.finished_at is not None]
+    excess = len(batches) - BATCH_HISTORY
+    for batch in finished:
+        if batch.finished_at < cutoff or excess > 0:
+            del batches[batch.batch_id]
+            excess -= 1
+
+
+def submit_batch(batch: Batch, steps, states: List[Dict[str, Any]]) -> asyncio.Task:
+    """
+    Register the batch and schedule it on the running event loop.
+    """
+    batches[batch.batch_id] = batch
+    evict_batches()
+    task = asyncio.get_running_loop().create_task(run_batch(batch, steps, states))
+    background_runs.add(task)
+    task.add_done_callback(background_runs.discard)
+    return task
@@ -0,0 +1,122 @@
+"""
+Read-through Redis cache for the GET endpoints.
+
+Every cached response is stored under the current version of each table it was read from
+(rcm:version:<table>). Whoever writes a table bumps its version after committing (the agents'
+audit writer, the orchestrator's workflow_runs updates), so later reads miss and refill
+instead of serving stale rows; the old entries are left to expire after CACHE_TTL.
+
+The cache is only used when REDIS_HOST is set. If Redis stops answering, reads go straight to
+Postgres and Redis is tried again after CACHE_RETRY_AFTER seconds.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pagination import NEXT_CURSOR_HEADER
+
+REDIS_HOST = os.getenv("REDIS_HOST")
+REDIS_PORT = int(os.getenv("REDIS_PORT") or "6379")
+CACHE_ENABLED = bool(REDIS_HOST) and os.getenv("CACHE_ENABLED", "true").lower() == "true"
+# Seconds a cached response may be served, also the longest a missed invalidation can go unseen
+CACHE_TTL = int(os.getenv("CACHE_TTL", "30"))
+CACHE_RETRY_AFTER = float(os.getenv("CACHE_RETRY_AFTER", "5"))
+CACHE_SOCKET_TIMEOUT = float(os.getenv("CACHE_SOCKET_TIMEOUT", "0.2"))
+
+VERSION_PREFIX = "rcm:version:"
+ENTRY_PREFIX = "rcm:cache:"
+CACHE_HEADER = "X-Cache"
+
+
+class ResponseCache:
+    def __init__(self, enabled: bool = CACHE_ENABLED, ttl: int = CACHE_TTL):
+        self.enabled = enabled
+        self.ttl = ttl
+        self._client = None
+        self._down_until = 0.0
+
+    def client(self):
+        if not self.enabled or time.monotonic() < self._down_until:
+            return None
+        if self._client is None:
+            self._client = redis.Redis(
+                host=REDIS_HOST, port=REDIS_PORT,
+                socket_timeout=CACHE_SOCKET_TIMEOUT, socket_connect_timeout=CACHE_SOCKET_TIMEOUT,
+                # Fail fast and fall back to Postgres rather than retrying on the request path
+                retry=Retry(NoBackoff(), 0),
+            )
+        return self._client
+
+    def _failed(self, e: Exception):
+        print(f"Response cache unavailable for {CACHE_RETRY_AFTER}s:", str(e))
+        self._down_until = time.monotonic() + CACHE_RETRY_AFTER
+
+    def read_through(self, request: Request, tables: Iterable[str], load: Callable[[Response], Any]) -> Response:
+        """
+        Serve the response for this request from Redis, or build it with load and cache it.
+
+        Args:
+            request (Request): The GET request, its path and query string are the cache key.
+            tables (Iterable[str]): Tables the response is read from.
+            load (Callable): Builds the response body; may set headers on the Response it is given.
+        Returns:
+            Response: JSON body, with X-Cache HIT or MISS.
+        """
+        tables = sorted(tables)
+        client = self.client()
+        key = None
+        if client is not None:
+            try:
+                versions = client.mget([VERSION_PREFIX + table for table in tables])
+                key = self.entry_key(request, tables, versions)
+                cached = client.get(key)
+                if cached is not None:
+                    entry = json.loads(cached)
+                    return self.response(entry["body"], entry["headers"], "HIT")
+            except redis.RedisError as e:
+                self._failed(e)
+                key = None
+
+        response = Response()
+        body = json.dumps(jsonable_encoder(load(response)))
+        headers = {name: response.headers[name] for name in (NEXT_CURSOR_HEADER,) if name in response.headers}
+        if key is not None:
+            try:
+                client.set(key, json.dumps({"body": body, "headers": headers}), ex=self.ttl)
+            except redis.RedisError as e:
+                self._failed(e)
+        return self.response(body, headers, "MISS")
+
+    @staticmethod
+    def entry_key(request: Request, tables, versions) -> str:
+        version = ",".join(f"{table}={int(v or 0)}" for table, v in zip(tables, versions))
+        url = f"{request.url.path}?{request.url.query}"
+        return ENTRY_PREFIX + hashlib.sha256(f"{version}|{url}".encode()).hexdigest()
+
+    @staticmethod
+    def response(body: str, headers: Dict[str, str], status: str) -> Response:
+        return Response(content=body, media_type="application/json", headers={**headers, CACHE_HEADER: status})
+
+    def invalidate(self, tables: Iterable[str]):
+        """
+        Bump the version of tables after a committed write, so cached reads of them miss.
+        """
+        client = self.client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for table in set(tables):
+                pipe.incr(VERSION_PREFIX + table)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._failed(e)
+
+
+response_cache = ResponseCache()
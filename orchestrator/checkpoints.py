@@ -0,0 +1,64 @@
+"""
+LangGraph checkpointer shared by every workflow run.
+
+With the postgres backend completed steps survive orchestrator restarts and agent
+failures, so a run can be resumed from its stored thread_id instead of starting over.
+"""
+import os
+from langgraph.checkpoint.memory import InMemorySaver
+from sqlalchemy.engine import make_url
+
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "postgres")  # postgres | memory
+CHECKPOINT_POOL_SIZE = int(os.getenv("CHECKPOINT_POOL_SIZE", "10"))
+
+_checkpointer = None
+_pool = None
+
+
+def postgres_conninfo(database_url: str) -> str:
+    """
+    Turn a SQLAlchemy URL (postgresql+psycopg2://...) into a plain libpq URL for psycopg.
+    """
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def open_checkpointer():
+    """
+    Create the checkpointer for the configured backend and make sure its tables exist.
+    """
+    global _checkpointer, _pool
+
+    if CHECKPOINT_BACKEND == "memory":
+        _checkpointer = InMemorySaver()
+        return _checkpointer
+
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+    _pool = AsyncConnectionPool(
+        conninfo=postgres_conninfo(os.getenv("DATABASE_URL")),
+        max_size=CHECKPOINT_POOL_SIZE,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        open=False,
+    )
+    await _pool.open()
+
+    _checkpointer = AsyncPostgresSaver(_pool)
+    await _checkpointer.setup()
+    print("Using postgres checkpointer.")
+    return _checkpointer
+
+
+def get_checkpointer():
+    if _checkpointer is None:
+        raise RuntimeError("Checkpointer is not open, call open_checkpointer() at startup.")
+    return _checkpointer
+
+
+async def close_checkpointer():
+    global _checkpointer, _pool
+    if _pool is not None:
+        await _pool.close()
+    _checkpointer = None
+    _pool = None
@@ -0,0 +1,35 @@
+"""
+Request contract between the orchestrator and the agents.
+
+Each agent declares the state fields it needs (its RunRequest) and answers with only the
+state key it produces ({"output": ...}). The orchestrator sends just those fields instead
+of the whole accumulated state, so payloads stay the same size at every step.
+"""
+from typing import Dict, Any
+
+# Identity fields every agent receives
+BASE_INPUTS = ("workflow_type", "workflow_id", "thread_id")
+
+# Mirrors the RunRequest model of each agent's api.py
+STEP_INPUTS: Dict[str, tuple] = {
+    "eligibility": BASE_INPUTS + ("file_path",),
+    "prior_auth": BASE_INPUTS,
+    "clinical_doc": BASE_INPUTS,
+    "medical_coding": BASE_INPUTS,
+    "claim_scrubbing": BASE_INPUTS,
+    "claim_submission": BASE_INPUTS,
+}
+
+
+def step_request(step: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The subset of the workflow state sent to a step's agent.
+    """
+    return {field: state[field] for field in STEP_INPUTS[step] if field in state}
+
+
+def step_output(step: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    State update for a step: the agent's output stored under the step's key.
+    """
+    return {step: response.get("output")}
@@ -1,5 +1,6 @@
 from concurrent.futures import thread
-from typing import Dict, Any
+from typing import Dict, Any, Annotated
+import operator
 
 class RCMState(Dict[str, Any]):
     workflow_type: str
@@ -18,5 +19,6 @@ class RCMState(Dict[str, Any]):
     success: bool
     error_message: str
     
-    retry_count: int
+    # Summed across updates: each resume adds 1
+    retry_count: Annotated[int, operator.add]
     source: str
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+In-process progress events for workflow runs, streamed to clients as Server-Sent Events.
+
+Events are published from the orchestrator's step wrappers, so the dashboard sees step
+progress as it happens instead of polling workflow_runs.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, AsyncIterator
+
+# Events kept per workflow so late subscribers get the full history
+HISTORY_SIZE = 100
+# Finished workflows whose history is kept around for late subscribers
+MAX_TRACKED_WORKFLOWS = 1000
+HEARTBEAT_SECONDS = 15
+
+TERMINAL_EVENTS = ("workflow-completed", "workflow-failed")
+
+
+class WorkflowEvents:
+    def __init__(self):
+        self._history: "OrderedDict[str, deque]" = OrderedDict()
+        self._subscribers: Dict[str, set] = {}
+
+    def publish(self, workflow_id: str, event: str, **data: Any):
+        """
+        Record an event for the workflow and push it to every live subscriber.
+        """
+        message = {"event": event, "workflow_id": workflow_id, "timestamp": time.time(), **data}
+
+        history = self._history.get(workflow_id)
+        if event == "workflow-started" and history is not None:
+            # A resumed run starts a fresh history, the previous attempt ended with a terminal event
+            history.clear()
+        if history is None:
+            history = self._history[workflow_id] = deque(maxlen=HISTORY_SIZE)
+            while len(self._history) > MAX_TRACKED_WORKFLOWS:
+                self._history.popitem(last=False)
+        history.append(message)
+
+        for queue in self._subscribers.get(workflow_id, ()):
+            queue.put_nowait(message)
+
+    def has_history(self, workflow_id: str) -> bool:
+        return workflow_id in self._history
+
+    async def subscribe(self, workflow_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield past and live events of a workflow until it completes or fails.
+
+        Yields None every HEARTBEAT_SECONDS without events, so callers can keep the connection alive.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for message in self._history.get(workflow_id, ()):
+            queue.put_nowait(message)
+        self._subscribers.setdefault(workflow_id, set()).add(queue)
+
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield message
+                if message["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            subscribers = self._subscribers.get(workflow_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[workflow_id]
+
+
+def format_sse(message: Dict[str, Any]) -> str:
+    if message is None:
+        return ": keep-alive\n\n"
+    return f"event: {message['event']}\ndata: {json.dumps(message, default=str)}\n\n"
+
+
+workflow_events = WorkflowEvents()
@@ -0,0 +1,96 @@
+"""
+Monolith mode (ORCHESTRATOR_MODE=monolith): run the agents inside the orchestrator process.
+
+Each agent's run_agent is imported from AGENTS_DIR and called on a worker thread, its audit
+rows going through the orchestrator's own pool, so a step costs a function call instead of
+JSON encoding, an HTTP hop and a separate service. The caller returns the same response shape
+as the agents' /run endpoint, so run_step and task_registry() work unchanged.
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Tuple
+import models  # noqa: F401 - the agents' `import models` must resolve to the orchestrator's copy
+
+AGENTS_DIR = Path(os.getenv("AGENTS_DIR", Path(__file__).resolve().parent.parent / "agents"))
+
+# Blocking agent code (OCR, LLM calls, DB writes) runs on this many threads
+MONOLITH_WORKERS = int(os.getenv("MONOLITH_WORKERS", "16"))
+
+AGENT_DIRS = {
+    "eligibility": "eligibility_agent",
+    "prior_auth": "prior_auth_agent",
+    "clinical_doc": "clinical_doc_agent",
+    "medical_coding": "medical_coding_agent",
+    "claim_scrubbing": "claim_scrubbing_agent",
+    "claim_submission": "claim_submission_agent",
+}
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_agents(agents_dir: Path = AGENTS_DIR) -> Tuple[Dict[str, Any], Any]:
+    """
+    Import every agent's main.py under a unique module name.
+
+    The agents import `metrics`, `llm` and `audit` as top-level modules (identical in every
+    agent, loaded once). `metrics` clashes with the orchestrator's own module, so while the
+    agents load it temporarily points at the agents' copy.
+
+    Returns:
+        (step -> agent main module, agents' metrics module)
+    """
+    shared_dir = agents_dir / AGENT_DIRS["eligibility"]
+    agent_metrics = _load_module("agent_metrics", shared_dir / "metrics.py")
+
+    saved = {name: sys.modules.get(name) for name in ("metrics", "llm", "audit")}
+    sys.modules["metrics"] = agent_metrics
+    try:
+        sys.modules["llm"] = _load_module("llm", shared_dir / "llm.py")
+        sys.modules["audit"] = _load_module("audit", shared_dir / "audit.py")
+        modules = {
+            step: _load_module(f"{agent_dir}_main", agents_dir / agent_dir / "main.py")
+            for step, agent_dir in AGENT_DIRS.items()
+        }
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return modules, agent_metrics
+
+
+class InProcessAgentCaller:
+    """
+    Drop-in for ResilientAgentCaller that calls run_agent directly.
+
+    There are no retries: an in-process failure is not transient the way a dropped
+    connection is, and the run can be resumed from its checkpoint instead.
+    """
+
+    def __init__(self, agents_dir: Path = AGENTS_DIR, workers: int = MONOLITH_WORKERS):
+        self.modules, self.agent_metrics = load_agents(agents_dir)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent")
+
+    def _run(self, step: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self.agent_metrics.track_run(step) as timings:
+            final_state = self.modules[step].run_agent(state=dict(payload))
+        return {"message": "Ran successfully", "output": final_state.get(step), "timings": timings}
+
+    async def call(self, step: str, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Returns:
+            (response in the agents' /run format, retries: always 0)
+        """
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(self.executor, self._run, step, payload)
+        return response, 0
@@ -2,61 +2,155 @@ from concurrent.futures import thread
 from typing import Dict, Any
 # from prefect import task, flow
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import InMemorySaver
-import requests
+from langgraph.types import Command
 from deps import RCMState
-from workflows import build_workflow
+from resilience import agent_caller
+from checkpoints import get_checkpointer
+from events import workflow_events
+from contracts import step_request, step_output
+from admission import admission
+from metrics import STEP_DURATION, WORKFLOW_DURATION, current_step_stats, record_agent_timings
+from workflows import get_compiled_workflow, with_checkpointer
+from cache import response_cache
 import uuid
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
+from database import SessionLocal
+import asyncio
+import functools
+import json
 import os
+import time
+
+# Workflow runs execute as asyncio tasks on the orchestrator's event loop,
+# admission control caps how many of each workflow_type run at once.
+
+# Strong references to in-flight runs so they are not garbage collected
+background_runs = set()
+
+# workflow_ids currently executing in this process
+active_workflows = set()
+
+# Step timings of in-flight runs, saved to workflow_step_timings when the run ends
+step_timings: Dict[str, list] = {}
+
+# distributed: agents are separate HTTP services. monolith: agents run in this process.
+ORCHESTRATOR_MODE = os.getenv("ORCHESTRATOR_MODE", "distributed").lower()
+
+if ORCHESTRATOR_MODE == "monolith":
+    from inprocess import InProcessAgentCaller
+    step_caller = InProcessAgentCaller()
+else:
+    step_caller = agent_caller
 
 def log_workflow_run(workflow_type: str, status: str, workflow_id: str, thread_id: str, db: Session):
     try:
         db.execute(text("INSERT INTO workflow_runs (workflow_id, thread_id, workflow_type, status, created_at, updated_at) VALUES (:workflow_id, :thread_id, :workflow_type, :status, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"),
                    {"workflow_id": workflow_id, "thread_id": thread_id, "workflow_type": workflow_type, "status": status})
         db.commit()
+        response_cache.invalidate(["workflow_runs"])
         print("Logged workflow run to database.")
     except Exception as e:
         print("Error logging workflow run:", str(e))
 
 
+async def run_step(step: str, state: RCMState) -> RCMState:
+    """
+    Send the agent only the fields it declares and return only the state key it produces.
+
+    Returning just that key also means steps running in parallel never write the same state key.
+    Retries made by the resilience layer are added to the run's retry_count.
+    In monolith mode the agent is called in-process and the same response shape comes back.
+    """
+    response, retries = await step_caller.call(step, step_request(step, state))
+    record_agent_timings(step, response.get("timings"))
+    update = step_output(step, response)
+    if retries:
+        update["retry_count"] = retries
+    return update
+
 # @task
-def eligibility_task(state: RCMState) -> RCMState:
+async def eligibility_task(state: RCMState) -> RCMState:
     print(state)
-    resp = requests.post("http://eligibility_agent:8000/run", json=state)
-    state["eligibility"] = resp.json()
-    return state
+    return await run_step("eligibility", state)
 
 # @task
-def prior_auth_task(state: RCMState) -> RCMState:
-    resp = requests.post("http://prior_auth_agent:8001/run", json=state)
-    state["prior_auth"] = resp.json()
-    return state
+async def prior_auth_task(state: RCMState) -> RCMState:
+    return await run_step("prior_auth", state)
 
 # @task
-def clinical_doc_task(state: RCMState) -> RCMState:
-    resp = requests.post("http://clinical_doc_agent:8002/run", json=state)
-    state["clinical_doc"] = resp.json()
-    return state
+async def clinical_doc_task(state: RCMState) -> RCMState:
+    return await run_step("clinical_doc", state)
 
-def medical_coding_task(state: RCMState) -> RCMState:
-    resp = requests.post("http://medical_coding_agent:8003/run", json=state)
-    state["medical_coding"] = resp.json()
-    return state
+async def medical_coding_task(state: RCMState) -> RCMState:
+    return await run_step("medical_coding", state)
 
-def claim_scrubbing_task(state: RCMState) -> RCMState:
-    resp = requests.post("http://claim_scrubbing_agent:8004/run", json=state)
-    state["claim_scrubbing"] = resp.json()
-    return state
+async def claim_scrubbing_task(state: RCMState) -> RCMState:
+    return await run_step("claim_scrubbing", state)
 
-def claim_submission_task(state: RCMState) -> RCMState:
-    resp = requests.post("http://claim_submission_agent:8005/run", json=state)
-    state["claim_submission"] = resp.json()
-    return state
+async def claim_submission_task(state: RCMState) -> RCMState:
+    return await run_step("claim_submission", state)
+
+def track_step(step: str, task):
+    """
+    Wrap a task so it publishes step-started/step-finished/step-failed events and records
+    its wall time, payload sizes and LLM time.
+    """
+    @functools.wraps(task)
+    async def tracked(state: RCMState) -> RCMState:
+        workflow_id = state.get("workflow_id")
+        workflow_events.publish(workflow_id, "step-started", step=step)
+        stats = {"step": step}
+        token = current_step_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            update = await task(state)
+        except Exception as e:
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            record_step(workflow_id, stats, "error", latency_ms)
+            workflow_events.publish(workflow_id, "step-failed", step=step, latency_ms=latency_ms, error=str(e))
+            raise
+        finally:
+            current_step_stats.reset(token)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        record_step(workflow_id, stats, "success", latency_ms)
+        workflow_events.publish(workflow_id, "step-finished", step=step, latency_ms=latency_ms)
+        return update
+
+    return tracked
+
+def record_step(workflow_id: str, stats: Dict[str, Any], outcome: str, latency_ms: float):
+    STEP_DURATION.labels(stats["step"], outcome).observe(latency_ms / 1000)
+    step_timings.setdefault(workflow_id, []).append({**stats, "outcome": outcome, "duration_ms": latency_ms})
+
+def log_step_timings(workflow_id: str, timings: list, db: Session):
+    """
+    Save per-step timings of a run, one multi-row insert per run.
+    """
+    if not timings:
+        return
+    try:
+        db.execute(text("INSERT INTO workflow_step_timings (workflow_run_id, step, outcome, duration_ms, request_bytes, response_bytes, llm_ms, created_at) VALUES (:workflow_run_id, :step, :outcome, :duration_ms, :request_bytes, :response_bytes, :llm_ms, CURRENT_TIMESTAMP)"),
+                   [
+                       {
+                           "workflow_run_id": workflow_id,
+                           "step": timing["step"],
+                           "outcome": timing["outcome"],
+                           "duration_ms": timing["duration_ms"],
+                           "request_bytes": timing.get("request_bytes"),
+                           "response_bytes": timing.get("response_bytes"),
+                           "llm_ms": timing.get("llm_ms"),
+                       }
+                       for timing in timings
+                   ])
+        db.commit()
+        response_cache.invalidate(["workflow_step_timings"])
+    except Exception as e:
+        db.rollback()
+        print("Error logging step timings:", str(e))
 
 def task_registry() -> Dict[str, Any]:
-    return {
+    tasks = {
         "eligibility": eligibility_task,
         "clinical_doc": clinical_doc_task,
         "prior_auth": prior_auth_task,
@@ -64,30 +158,140 @@ def task_registry() -> Dict[str, Any]:
         "claim_scrubbing": claim_scrubbing_task,
         "claim_submission": claim_submission_task,
     }
+    return {step: track_step(step, task) for step, task in tasks.items()}
+
+def update_workflow_run(workflow_id: str, db: Session, **fields):
+    """
+    Update status/result columns of an existing workflow run.
+    """
+    try:
+        assignments = ", ".join(f"{column} = :{column}" for column in fields)
+        db.execute(text(f"UPDATE workflow_runs SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE workflow_id = :workflow_id"),
+                   {"workflow_id": workflow_id, **fields})
+        db.commit()
+        response_cache.invalidate(["workflow_runs"])
+        print("Updated workflow run", workflow_id, "with", list(fields))
+    except Exception as e:
+        db.rollback()
+        print("Error updating workflow run:", str(e))
+
+
+def create_workflow_run(workflow_type: str, file_path: str, db: Session) -> RCMState:
+    """
+    Record a new workflow run and return the initial state used to execute it.
+    """
+    id = str(uuid.uuid4())
+    thread_id = f"rcm_thread_{id}"
+
+    # Initial state
+    state = {
+        "workflow_type": workflow_type,
+        "success": True,
+        "retry_count": 0,
+        "file_path": file_path,
+        "workflow_id": id,
+        "thread_id": thread_id,
+    }
+
+    log_workflow_run(workflow_type=workflow_type, status="started", workflow_id=id, thread_id=thread_id, db=db)  # Log workflow start
+    return state
+
+
+def workflow_config(thread_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def checkpointed_workflow(steps):
+    return with_checkpointer(get_compiled_workflow(steps, task_registry()), get_checkpointer())
+
+
+async def execute_workflow(steps, graph_input, workflow_type: str, workflow_id: str, thread_id: str, db: Session) -> RCMState:
+    """
+    Invoke the graph on the run's thread and record the outcome and step timings on the run.
+
+    graph_input is the initial state for a new run, or a Command to resume a stored thread.
+    """
+    app = checkpointed_workflow(steps)
+
+    # DB writes are blocking, keep them off the event loop
+    await asyncio.to_thread(update_workflow_run, workflow_id, db=db, status="in_progress", error_message=None)
+    workflow_events.publish(workflow_id, "workflow-started", resumed=isinstance(graph_input, Command))
+    started = time.perf_counter()
+
+    try:
+        final_state = await app.ainvoke(graph_input, config=workflow_config(thread_id))
+    except Exception as e:
+        await asyncio.to_thread(update_workflow_run, workflow_id, db=db, status="failed", error_message=str(e))
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        WORKFLOW_DURATION.labels(workflow_type, "error").observe(latency_ms / 1000)
+        workflow_events.publish(workflow_id, "workflow-failed", latency_ms=latency_ms, error=str(e))
+        raise
+    finally:
+        await asyncio.to_thread(log_step_timings, workflow_id, step_timings.pop(workflow_id, []), db=db)
+
+    await asyncio.to_thread(update_workflow_run, workflow_id, db=db, status="completed", result=json.dumps(final_state, default=str))
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    WORKFLOW_DURATION.labels(workflow_type, "success").observe(latency_ms / 1000)
+    workflow_events.publish(workflow_id, "workflow-completed", latency_ms=latency_ms)
+    return final_state
+
 
 # Prefect Flow
 # @flow
-def rcm_pipeline(steps, workflow_type: str, file_path: str, db: Session) -> RCMState:
+async def rcm_pipeline(steps, state: RCMState, db: Session) -> RCMState:
     """
     Run RCM workflow based on selected steps.
 
     Lets us run different workflows based on user needs. Also for proper intergration with different UI's.
     """
+    return await execute_workflow(steps, state, workflow_type=state["workflow_type"], workflow_id=state["workflow_id"], thread_id=state["thread_id"], db=db)
 
-    # Initial state
-    state = {"workflow_type": workflow_type, "success": True, "retry_count": 0, "file_path": file_path}
-    workflow = build_workflow(steps, task_registry())
-    
-    memory = InMemorySaver()
-    app = workflow.compile(checkpointer=memory)
 
-    id = str(uuid.uuid4())
-    thread_id = f"rcm_thread_{id}"
+async def get_workflow_snapshot(steps, thread_id: str):
+    """
+    Latest checkpoint of a run's thread. snapshot.next lists the steps still to run.
+    """
+    return await checkpointed_workflow(steps).aget_state(workflow_config(thread_id))
 
-    state["workflow_id"] = id
-    state["thread_id"] = thread_id
 
-    log_workflow_run(workflow_type=workflow_type, status="started", workflow_id=id, thread_id=thread_id, db=db)  # Log workflow start
+async def resume_pipeline(steps, workflow_type: str, workflow_id: str, thread_id: str, db: Session) -> RCMState:
+    """
+    Resume a stored run from its last checkpoint.
+
+    Steps that already succeeded are not re-run, only the failed/pending ones. retry_count is
+    accumulated in the state so agents and the UI can see how often the run was retried.
+    """
+    return await execute_workflow(steps, Command(update={"retry_count": 1}), workflow_type=workflow_type, workflow_id=workflow_id, thread_id=thread_id, db=db)
+
+
+async def run_workflow_in_background(steps, state: RCMState, resume: bool = False) -> RCMState:
+    """
+    Background entrypoint: runs the pipeline with its own DB session, since the request session is closed by then.
+
+    The run must have been admitted with admission.admit(); it waits here for an in-flight slot.
+    """
+    async with admission.slot(state["workflow_type"]):
+        db = SessionLocal()
+        try:
+            if resume:
+                return await resume_pipeline(steps=steps, workflow_type=state["workflow_type"], workflow_id=state["workflow_id"], thread_id=state["thread_id"], db=db)
+            return await rcm_pipeline(steps=steps, state=state, db=db)
+        except Exception as e:
+            print("Workflow", state["workflow_id"], "failed:", str(e))
+        finally:
+            db.close()
+
+
+def submit_workflow(steps, state: RCMState, resume: bool = False) -> asyncio.Task:
+    """
+    Schedule a recorded workflow run on the running event loop.
+
+    With resume=True only workflow_id/thread_id/workflow_type are read from state and the run continues from its checkpoint.
+    """
+    task = asyncio.get_running_loop().create_task(run_workflow_in_background(steps, state, resume=resume))
+    background_runs.add(task)
+    task.add_done_callback(background_runs.discard)
 
-    final_state = app.invoke(state, config={"configurable": {"thread_id": thread_id}})
-    return final_state
\ No newline at end of file
+    active_workflows.add(state["workflow_id"])
+    task.add_done_callback(lambda _: active_workflows.discard(state["workflow_id"]))
+    return task
@@ -0,0 +1,55 @@
+"""
+Prometheus metrics for the orchestrator, exposed on /metrics.
+"""
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+from fastapi import Response
+from prometheus_client import Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+STEP_DURATION = Histogram(
+    "rcm_step_duration_seconds", "Wall time of a workflow step as seen by the orchestrator",
+    ["step", "outcome"], buckets=LATENCY_BUCKETS,
+)
+STEP_PAYLOAD_BYTES = Histogram(
+    "rcm_step_payload_bytes", "Bytes sent to (request) and received from (response) an agent",
+    ["step", "direction"], buckets=SIZE_BUCKETS,
+)
+STEP_LLM_DURATION = Histogram(
+    "rcm_step_llm_seconds", "LLM time reported by the agent for a step",
+    ["step"], buckets=LATENCY_BUCKETS,
+)
+WORKFLOW_DURATION = Histogram(
+    "rcm_workflow_duration_seconds", "Wall time of a whole workflow run",
+    ["workflow_type", "outcome"], buckets=LATENCY_BUCKETS,
+)
+
+# Stats of the step executing in the current task, filled in by the transport and run_step
+current_step_stats: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_step_stats", default=None)
+
+
+def record_transfer(step: str, request_bytes: int, response_bytes: int):
+    STEP_PAYLOAD_BYTES.labels(step, "request").observe(request_bytes)
+    STEP_PAYLOAD_BYTES.labels(step, "response").observe(response_bytes)
+    stats = current_step_stats.get()
+    if stats is not None:
+        stats["request_bytes"] = stats.get("request_bytes", 0) + request_bytes
+        stats["response_bytes"] = stats.get("response_bytes", 0) + response_bytes
+
+
+def record_agent_timings(step: str, timings: Optional[Dict[str, Any]]):
+    """
+    Record the timings an agent reports in its response ({"run_seconds", "llm_seconds"}).
+    """
+    if not timings or timings.get("llm_seconds") is None:
+        return
+    STEP_LLM_DURATION.labels(step).observe(timings["llm_seconds"])
+    stats = current_step_stats.get()
+    if stats is not None:
+        stats["llm_ms"] = round(timings["llm_seconds"] * 1000, 1)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
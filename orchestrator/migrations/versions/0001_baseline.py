@@ -0,0 +1,151 @@
+"""Baseline: the schema previously created by Base.metadata.create_all
+
+Tables that already exist (databases created before migrations) are left alone, so
+`alembic upgrade head` works on both new and existing databases.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-09-20
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def timestamps():
+    return [sa.Column("created_at", sa.String, nullable=False), sa.Column("updated_at", sa.String, nullable=False)]
+
+
+def artifact_columns():
+    return timestamps() + [sa.Column("workflow_run_id", sa.String, nullable=False)]
+
+
+def tables():
+    return {
+        "users": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("name", sa.String, unique=True, index=True, nullable=False),
+            sa.Column("email", sa.String, unique=True, index=True, nullable=False),
+            sa.Column("user_type", sa.String, nullable=False),
+            sa.Column("password", sa.String, nullable=False),
+            *timestamps(),
+        ],
+        "workflow_runs": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("workflow_id", sa.String, index=True, nullable=False),
+            sa.Column("thread_id", sa.String, index=True, nullable=False),
+            sa.Column("patient_id", sa.String, index=True, nullable=True),
+            sa.Column("workflow_type", sa.String, index=True, nullable=False),
+            sa.Column("current_step", sa.String, nullable=True),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            sa.Column("result", sa.String, nullable=True),
+            sa.Column("error_message", sa.String, nullable=True),
+            *timestamps(),
+        ],
+        "workflow_step_timings": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("workflow_run_id", sa.String, index=True, nullable=False),
+            sa.Column("step", sa.String, index=True, nullable=False),
+            sa.Column("outcome", sa.String, nullable=False),
+            sa.Column("duration_ms", sa.Float, nullable=False),
+            sa.Column("request_bytes", sa.Integer, nullable=True),
+            sa.Column("response_bytes", sa.Integer, nullable=True),
+            sa.Column("llm_ms", sa.Float, nullable=True),
+            sa.Column("created_at", sa.String, nullable=False),
+        ],
+        "eligibility_checks": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("patient_id", sa.String, index=True, nullable=True),
+            sa.Column("insurance_id", sa.String, nullable=False),
+            sa.Column("plan", sa.String, nullable=False),
+            sa.Column("copay", sa.String, nullable=False),
+            sa.Column("eligible", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "prior_auths": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("patient_id", sa.String, index=True, nullable=True),
+            sa.Column("procedure_code", sa.String, nullable=False),
+            sa.Column("auth_number", sa.String, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "clinical_documents": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("patient_id", sa.String, index=True, nullable=True),
+            sa.Column("document_type", sa.String, nullable=False),
+            sa.Column("content", sa.String, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "claims_scrubbing": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("patient_id", sa.String, index=True, nullable=True),
+            sa.Column("procedure_code", sa.String, nullable=False),
+            sa.Column("diagnosis_code", sa.String, nullable=False),
+            sa.Column("operative_report", sa.String, nullable=False),
+            sa.Column("pre_op_clearance", sa.String, nullable=False),
+            sa.Column("physician_signature", sa.String, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "claims": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("claim_id", sa.String, index=True, nullable=False),
+            sa.Column("patient_summary", sa.String, nullable=False),
+            sa.Column("procedure_performed", sa.String, nullable=False),
+            sa.Column("codes", sa.String, nullable=False),
+            sa.Column("documentation", sa.String, nullable=False),
+            sa.Column("payer", sa.String, nullable=False),
+            sa.Column("provider", sa.String, nullable=False),
+            sa.Column("submission_date", sa.String, nullable=False),
+            sa.Column("submission_status", sa.String, nullable=False),
+            sa.Column("tracking_id", sa.String, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "resubmissions": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("claim_id", sa.String, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "denials": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("claim_id", sa.Integer, nullable=False),
+            sa.Column("resubmission_id", sa.Integer, nullable=True),
+            sa.Column("reason", sa.String, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "payments": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("claim_id", sa.Integer, nullable=False),
+            sa.Column("amount", sa.String, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+        "reconciliations": [
+            sa.Column("id", sa.Integer, primary_key=True, index=True),
+            sa.Column("claim_id", sa.Integer, nullable=False),
+            sa.Column("payment_id", sa.Integer, nullable=False),
+            sa.Column("status", sa.String, index=True, nullable=False),
+            *artifact_columns(),
+        ],
+    }
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, columns in tables().items():
+        if name not in existing:
+            op.create_table(name, *columns)
+
+
+def downgrade():
+    for name in reversed(list(tables())):
+        op.drop_table(name)
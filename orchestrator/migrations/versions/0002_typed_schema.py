@@ -0,0 +1,125 @@
+"""Real column types, foreign keys and query indexes
+
+- created_at/updated_at: varchar -> timestamptz (default now())
+- eligibility_checks.eligible -> boolean, payments.amount -> numeric(12, 2)
+- resubmissions.claim_id -> integer; denials/payments/reconciliations/resubmissions
+  reference claims.id
+- workflow_runs.workflow_id unique, referenced by every table's workflow_run_id
+- indexes on workflow_run_id, claim_id and (status, created_at)
+
+Foreign keys are added NOT VALID: new rows are checked, rows written before the constraint
+existed (e.g. workflow_run_id "0") are left as they are.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-09-20
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TIMESTAMPED_TABLES = (
+    "users", "workflow_runs", "eligibility_checks", "prior_auths", "clinical_documents",
+    "claims_scrubbing", "claims", "resubmissions", "denials", "payments", "reconciliations",
+)
+
+# Tables with a workflow_run_id column (workflow_step_timings already has its index)
+WORKFLOW_RUN_TABLES = (
+    "workflow_step_timings", "eligibility_checks", "prior_auths", "clinical_documents",
+    "claims_scrubbing", "claims", "resubmissions", "denials", "payments", "reconciliations",
+)
+
+STATUS_TABLES = (
+    "workflow_runs", "prior_auths", "clinical_documents", "claims_scrubbing", "claims",
+    "resubmissions", "denials", "payments", "reconciliations",
+)
+
+# (table, column, referenced table, referenced column, indexed)
+CLAIM_REFERENCES = (
+    ("resubmissions", "claim_id", "claims", "id", True),
+    ("denials", "claim_id", "claims", "id", True),
+    ("denials", "resubmission_id", "resubmissions", "id", False),
+    ("payments", "claim_id", "claims", "id", True),
+    ("reconciliations", "claim_id", "claims", "id", True),
+    ("reconciliations", "payment_id", "payments", "id", True),
+)
+
+
+def add_foreign_key(table, column, ref_table, ref_column, ondelete=None):
+    # Named like Postgres names the unnamed constraints declared in models.py
+    on_delete = f" ON DELETE {ondelete}" if ondelete else ""
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey FOREIGN KEY ({column}) "
+        f"REFERENCES {ref_table} ({ref_column}){on_delete} NOT VALID"
+    )
+
+
+def to_timestamptz(table, column):
+    op.alter_column(
+        table, column,
+        type_=sa.DateTime(timezone=True),
+        postgresql_using=f"{column}::timestamptz",
+        server_default=sa.func.now(),
+    )
+
+
+def upgrade():
+    for table in TIMESTAMPED_TABLES:
+        to_timestamptz(table, "created_at")
+        to_timestamptz(table, "updated_at")
+    to_timestamptz("workflow_step_timings", "created_at")
+
+    op.alter_column("eligibility_checks", "eligible", type_=sa.Boolean(), nullable=True,
+                    postgresql_using="lower(eligible)::boolean")
+    op.alter_column("payments", "amount", type_=sa.Numeric(12, 2), postgresql_using="amount::numeric")
+    op.alter_column("resubmissions", "claim_id", type_=sa.Integer(), postgresql_using="claim_id::integer")
+
+    # workflow_id becomes the target of the workflow_run_id foreign keys
+    op.drop_index("ix_workflow_runs_workflow_id", table_name="workflow_runs")
+    op.create_index("ix_workflow_runs_workflow_id", "workflow_runs", ["workflow_id"], unique=True)
+
+    for table in WORKFLOW_RUN_TABLES:
+        if table != "workflow_step_timings":
+            op.create_index(f"ix_{table}_workflow_run_id", table, ["workflow_run_id"])
+        add_foreign_key(table, "workflow_run_id", "workflow_runs", "workflow_id", ondelete="CASCADE")
+
+    for table, column, ref_table, ref_column, indexed in CLAIM_REFERENCES:
+        if indexed:
+            op.create_index(f"ix_{table}_{column}", table, [column])
+        add_foreign_key(table, column, ref_table, ref_column)
+
+    for table in STATUS_TABLES:
+        op.create_index(f"ix_{table}_status_created_at", table, ["status", "created_at"])
+    op.create_index("ix_eligibility_checks_created_at", "eligibility_checks", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_eligibility_checks_created_at", table_name="eligibility_checks")
+    for table in STATUS_TABLES:
+        op.drop_index(f"ix_{table}_status_created_at", table_name=table)
+
+    for table, column, _, _, indexed in CLAIM_REFERENCES:
+        op.drop_constraint(f"{table}_{column}_fkey", table, type_="foreignkey")
+        if indexed:
+            op.drop_index(f"ix_{table}_{column}", table_name=table)
+
+    for table in WORKFLOW_RUN_TABLES:
+        op.drop_constraint(f"{table}_workflow_run_id_fkey", table, type_="foreignkey")
+        if table != "workflow_step_timings":
+            op.drop_index(f"ix_{table}_workflow_run_id", table_name=table)
+
+    op.drop_index("ix_workflow_runs_workflow_id", table_name="workflow_runs")
+    op.create_index("ix_workflow_runs_workflow_id", "workflow_runs", ["workflow_id"])
+
+    op.alter_column("resubmissions", "claim_id", type_=sa.String(), postgresql_using="claim_id::text")
+    op.alter_column("payments", "amount", type_=sa.String(), postgresql_using="amount::text")
+    op.alter_column("eligibility_checks", "eligible", type_=sa.String(), postgresql_using="eligible::text")
+
+    for table in TIMESTAMPED_TABLES + ("workflow_step_timings",):
+        columns = ("created_at",) if table == "workflow_step_timings" else ("created_at", "updated_at")
+        for column in columns:
+            op.alter_column(table, column, type_=sa.String(), server_default=None, postgresql_using=f"{column}::text")
@@ -0,0 +1,54 @@
+"""Dashboard summary counters
+
+summary_counters holds artifact counts per (metric, value), bumped by the agents as they
+insert rows. It is filled from the existing rows here; `python summary.py rebuild` does
+the same on demand.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-09-27
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs of models.SUMMARY_COUNTERS at this revision
+SUMMARY_COUNTERS = (
+    ("eligibility_checks", "eligible"),
+    ("prior_auths", "status"),
+    ("clinical_documents", "status"),
+    ("claims_scrubbing", "status"),
+    ("claims", "status"),
+    ("claims", "submission_status"),
+    ("resubmissions", "status"),
+    ("denials", "status"),
+    ("payments", "status"),
+    ("reconciliations", "status"),
+)
+
+
+def upgrade():
+    op.create_table(
+        "summary_counters",
+        sa.Column("metric", sa.String, primary_key=True),
+        sa.Column("value", sa.String, primary_key=True),
+        sa.Column("count", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    for table, column in SUMMARY_COUNTERS:
+        if column == "eligible":
+            value = "CASE WHEN eligible IS NULL THEN 'unknown' WHEN eligible THEN 'true' ELSE 'false' END"
+        else:
+            value = f"COALESCE({column}, 'unknown')"
+        op.execute(
+            f"INSERT INTO summary_counters (metric, value, count) "
+            f"SELECT '{table}.{column}', {value}, count(*) FROM {table} GROUP BY 2"
+        )
+
+
+def downgrade():
+    op.drop_table("summary_counters")
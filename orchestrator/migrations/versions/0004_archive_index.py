@@ -0,0 +1,22 @@
+"""Index workflow_runs.created_at for monthly archival
+
+archive.py selects a month of runs by created_at, then their artifacts by workflow_run_id.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-10-04
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_workflow_runs_created_at", "workflow_runs", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_workflow_runs_created_at", table_name="workflow_runs")
@@ -0,0 +1,122 @@
+"""
+Keyset pagination, filtering and sorting for the list endpoints.
+
+Pages are fetched with `WHERE (sort_column, id) > (last_value, last_id) ORDER BY sort_column, id LIMIT n`,
+so every page costs the same no matter how deep into the table it is.
+"""
+import base64
+import datetime
+import json
+import os
+import re
+from typing import Optional, Tuple, List, Any
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import DateTime, and_, or_
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+
+# Indexed columns that may be filtered on / sorted by, where the model has them
+FILTER_COLUMNS = ("status", "workflow_run_id", "patient_id", "workflow_type")
+SORT_COLUMNS = ("id", "created_at", "updated_at", "status")
+# Dashboard sort fields that name a sortable column differently
+SORT_ALIASES = {"dateSubmitted": "created_at", "lastUpdate": "updated_at"}
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """
+    Query parameters shared by every list endpoint, used as `page: PageParams = Depends()`.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description=f"Value of the {NEXT_CURSOR_HEADER} header of the previous page"),
+        sort_by: str = Query("id"),
+        order: str = Query("asc", pattern="^(asc|desc)$"),
+        sort_by_alias: Optional[str] = Query(None, alias="sortBy", description="Dashboard alias of sort_by, camelCase"),
+        order_alias: Optional[str] = Query(None, alias="sortDir", pattern="^(asc|desc)$", description="Dashboard alias of order"),
+        status: Optional[str] = Query(None, description='"all" is the same as no status filter'),
+        workflow_run_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        workflow_type: Optional[str] = None,
+    ):
+        if sort_by_alias is not None:
+            # The dashboard sorts by its own field names (createdAt, dateSubmitted, ...);
+            # the ones that are not sortable columns here keep the default order
+            sort_by = SORT_ALIASES.get(sort_by_alias) or re.sub(r"(?<!^)(?=[A-Z])", "_", sort_by_alias).lower()
+            if sort_by not in SORT_COLUMNS:
+                sort_by = "id"
+        self.limit = limit
+        self.cursor = cursor
+        self.sort_by = sort_by
+        self.order = order_alias or order
+        self.filters = {
+            "status": None if status == "all" else status,
+            "workflow_run_id": workflow_run_id,
+            "patient_id": patient_id,
+            "workflow_type": workflow_type,
+        }
+
+
+def encode_cursor(sort_value: Any, id: int) -> str:
+    if isinstance(sort_value, datetime.datetime):
+        sort_value = sort_value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([sort_value, id], default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        sort_value, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return sort_value, int(id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, model, page: PageParams, response: Response) -> List[Any]:
+    """
+    Apply filters, keyset cursor, ordering and limit to a query of `model`.
+
+    The cursor for the following page is returned in the X-Next-Cursor response header
+    (absent on the last page), the body stays a plain list.
+    """
+    for column, value in page.filters.items():
+        if value is None:
+            continue
+        if not hasattr(model, column):
+            raise HTTPException(status_code=400, detail=f"Cannot filter {model.__tablename__} by {column}")
+        query = query.filter(getattr(model, column) == value)
+
+    if page.sort_by not in SORT_COLUMNS or not hasattr(model, page.sort_by):
+        raise HTTPException(status_code=400, detail=f"Cannot sort {model.__tablename__} by {page.sort_by}")
+
+    sort_column = getattr(model, page.sort_by)
+    descending = page.order == "desc"
+
+    if page.cursor:
+        sort_value, last_id = decode_cursor(page.cursor)
+        if isinstance(sort_column.type, DateTime) and sort_value is not None:
+            sort_value = datetime.datetime.fromisoformat(sort_value)
+        if page.sort_by == "id":
+            query = query.filter(model.id < last_id if descending else model.id > last_id)
+        elif descending:
+            query = query.filter(or_(sort_column < sort_value, and_(sort_column == sort_value, model.id < last_id)))
+        else:
+            query = query.filter(or_(sort_column > sort_value, and_(sort_column == sort_value, model.id > last_id)))
+
+    if page.sort_by == "id":
+        ordering = [model.id.desc() if descending else model.id.asc()]
+    else:
+        ordering = [sort_column.desc(), model.id.desc()] if descending else [sort_column.asc(), model.id.asc()]
+
+    # One extra row tells us whether there is a next page
+    rows = query.order_by(*ordering).limit(page.limit + 1).all()
+
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, page.sort_by), last.id)
+
+    return rows
@@ -0,0 +1,188 @@
+"""
+Resilience layer around orchestrator -> agent calls.
+
+Per-agent circuit breakers stop a failing agent from tying up workflow runs, retries with
+jittered exponential backoff ride out agents that are unreachable or busy, and optional
+hedged requests cap tail latency when an agent is slow.
+"""
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Dict, Any, Tuple
+import httpx
+from transport import AgentTransport, agent_transport
+
+AGENT_MAX_RETRIES = int(os.getenv("AGENT_MAX_RETRIES", "3"))
+AGENT_BACKOFF_BASE = float(os.getenv("AGENT_BACKOFF_BASE", "0.5"))
+AGENT_BACKOFF_MAX = float(os.getenv("AGENT_BACKOFF_MAX", "10"))
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+
+# Hedging sends a second request to the same agent, which then does (and logs) the work twice,
+# so it is off unless explicitly enabled.
+AGENT_HEDGING = os.getenv("AGENT_HEDGING", "false").lower() == "true"
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "200"))
+
+
+class CircuitOpenError(Exception):
+    """Raised when an agent's circuit breaker is open and the call is not attempted."""
+
+
+class CircuitBreaker:
+    """
+    closed: calls pass. open: calls fail fast until reset_timeout has elapsed.
+    half_open: a single probe call is let through, its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """
+    Rolling window of successful call latencies (seconds).
+    """
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def p95(self):
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Only errors where the agent cannot have done the work are retried: the connection was
+    never made, or the agent refused the request (429, 503). Agents are not idempotent, so
+    after a read timeout or another 5xx the step may already have written its artifacts and
+    bumped the summary counters, and a retry would do it all again.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in (429, 503)
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff.
+    """
+    return random.uniform(0, min(AGENT_BACKOFF_MAX, AGENT_BACKOFF_BASE * 2 ** attempt))
+
+
+class ResilientAgentCaller:
+    def __init__(self, transport: AgentTransport = agent_transport):
+        self.transport = transport
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latencies: Dict[str, LatencyTracker] = {}
+
+    def breaker(self, step: str) -> CircuitBreaker:
+        return self.breakers.setdefault(step, CircuitBreaker())
+
+    def latency(self, step: str) -> LatencyTracker:
+        return self.latencies.setdefault(step, LatencyTracker())
+
+    async def call(self, step: str, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Call the agent, retrying transient failures.
+
+        Returns:
+            (response body, number of retries it took)
+
+        Raises:
+            CircuitOpenError: If the agent's breaker is open.
+            httpx.HTTPError: If the last attempt failed or the error is not retryable.
+        """
+        breaker = self.breaker(step)
+        for attempt in range(AGENT_MAX_RETRIES + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for agent {step}")
+            try:
+                response = await self._hedged(step, payload)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The agent answered, it is not unhealthy
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == AGENT_MAX_RETRIES:
+                    raise
+                delay = backoff_delay(attempt)
+                print(f"Agent {step} failed ({e!r}), retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return response, attempt
+
+    async def _timed(self, step: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        response = await self.transport.post(step, payload)
+        self.latency(step).record(time.perf_counter() - started)
+        return response
+
+    async def _hedged(self, step: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send the request; if hedging is on and it outlives the agent's p95, send a second
+        one and take whichever succeeds first.
+        """
+        p95 = self.latency(step).p95() if AGENT_HEDGING else None
+        if p95 is None:
+            return await self._timed(step, payload)
+
+        first = asyncio.ensure_future(self._timed(step, payload))
+        done, _ = await asyncio.wait({first}, timeout=p95)
+        if done:
+            return first.result()
+
+        pending = {first, asyncio.ensure_future(self._timed(step, payload))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+agent_caller = ResilientAgentCaller()
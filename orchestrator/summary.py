@@ -0,0 +1,81 @@
+"""
+Dashboard summary: artifact counts by status, read from summary_counters.
+
+The agents bump the counters in the same transaction that inserts the artifact rows (see
+their audit.py), so reading the summary costs one small query however large the artifact
+tables grow. `python summary.py rebuild` recounts everything from the artifact tables, for
+counters that drifted or rows written outside the agents.
+
+Archiving a month (archive.py) leaves the counters alone, so they cover archived rows too;
+a rebuild adds the counts stored in the archive manifests.
+"""
+import argparse
+from typing import Dict
+from sqlalchemy import Boolean, case, cast, func, literal, select, String, text
+from database import Base, engine
+from cache import response_cache
+from archive import archived_summary
+import models
+
+INCREMENT_COUNTER = text(
+    "INSERT INTO summary_counters (metric, value, count) VALUES (:metric, :value, :count) "
+    "ON CONFLICT (metric, value) DO UPDATE SET count = summary_counters.count + excluded.count, "
+    "updated_at = CURRENT_TIMESTAMP"
+)
+
+
+def read_summary(db) -> Dict[str, Dict[str, int]]:
+    """
+    Returns:
+        dict: metric ("<table>.<column>") -> value -> count. Every metric is present, with
+        an empty dict when nothing has been counted yet.
+    """
+    summary = {f"{table}.{column}": {} for table, column in models.SUMMARY_COUNTERS}
+    for counter in db.query(models.SummaryCounter).order_by(models.SummaryCounter.metric, models.SummaryCounter.value):
+        summary.setdefault(counter.metric, {})[counter.value] = counter.count
+    return summary
+
+
+def value_expression(column):
+    """
+    SQL version of models.summary_value, so recounted values match the incremented ones.
+    """
+    if isinstance(column.type, Boolean):
+        return case((column.is_(None), "unknown"), (column, "true"), else_="false")
+    return func.coalesce(cast(column, String), "unknown")
+
+
+def rebuild_summary():
+    """
+    Replace summary_counters with fresh counts from the artifact tables plus the archived
+    months, in one transaction.
+
+    On Postgres the counters are locked first: agents committing artifacts meanwhile wait to
+    bump their counters until the rebuild commits, so their rows are counted exactly once.
+    """
+    counters = models.SummaryCounter.__table__
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("LOCK TABLE summary_counters IN EXCLUSIVE MODE"))
+        conn.execute(counters.delete())
+        for table_name, column_name in models.SUMMARY_COUNTERS:
+            table = Base.metadata.tables[table_name]
+            value = value_expression(table.c[column_name])
+            query = (
+                select(literal(f"{table_name}.{column_name}"), value, func.count())
+                .select_from(table)
+                .group_by(value)
+            )
+            conn.execute(counters.insert().from_select(["metric", "value", "count"], query))
+        archived = [{"metric": metric, "value": value, "count": count} for (metric, value), count in sorted(archived_summary().items())]
+        if archived:
+            conn.execute(INCREMENT_COUNTER, archived)
+    response_cache.invalidate([counters.name])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard summary counters")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+    rebuild_summary()
+    print("Rebuilt summary_counters")
@@ -0,0 +1,113 @@
+"""
+Shared HTTP transport for orchestrator -> agent calls.
+
+One keep-alive connection pool per agent, reused by every workflow run, instead of
+a fresh TCP connection per step.
+"""
+import os
+from typing import Dict, Any, Optional
+import httpx
+from metrics import record_transfer
+
+AGENT_URLS = {
+    "eligibility": os.getenv("ELIGIBILITY_AGENT_URL", "http://eligibility_agent:8000"),
+    "prior_auth": os.getenv("PRIOR_AUTH_AGENT_URL", "http://prior_auth_agent:8001"),
+    "clinical_doc": os.getenv("CLINICAL_DOC_AGENT_URL", "http://clinical_doc_agent:8002"),
+    "medical_coding": os.getenv("MEDICAL_CODING_AGENT_URL", "http://medical_coding_agent:8003"),
+    "claim_scrubbing": os.getenv("CLAIM_SCRUBBING_AGENT_URL", "http://claim_scrubbing_agent:8004"),
+    "claim_submission": os.getenv("CLAIM_SUBMISSION_AGENT_URL", "http://claim_submission_agent:8005"),
+}
+
+# Per-agent pool sizing
+AGENT_MAX_CONNECTIONS = int(os.getenv("AGENT_MAX_CONNECTIONS", "50"))
+AGENT_MAX_KEEPALIVE = int(os.getenv("AGENT_MAX_KEEPALIVE", "20"))
+AGENT_KEEPALIVE_EXPIRY = float(os.getenv("AGENT_KEEPALIVE_EXPIRY", "30"))
+
+# Timeouts (seconds). Agents wait on LLM round-trips, so reads get a long budget.
+AGENT_CONNECT_TIMEOUT = float(os.getenv("AGENT_CONNECT_TIMEOUT", "5"))
+AGENT_READ_TIMEOUT = float(os.getenv("AGENT_READ_TIMEOUT", "120"))
+AGENT_POOL_TIMEOUT = float(os.getenv("AGENT_POOL_TIMEOUT", "10"))
+
+# HTTP/2 is negotiated over TLS (ALPN); plain http:// agents stay on HTTP/1.1 keep-alive.
+AGENT_HTTP2 = os.getenv("AGENT_HTTP2", "true").lower() == "true"
+
+# json or msgpack. Agents answer msgpack only when asked, so upgrade the agents before
+# switching the orchestrator to msgpack.
+AGENT_WIRE_FORMAT = os.getenv("AGENT_WIRE_FORMAT", "json").lower()
+MSGPACK = "application/msgpack"
+
+if AGENT_WIRE_FORMAT == "msgpack":
+    import msgpack
+
+
+def encode_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    httpx request arguments for a /run payload in the configured wire format.
+    """
+    if AGENT_WIRE_FORMAT == "msgpack":
+        return {"content": msgpack.packb(payload), "headers": {"Content-Type": MSGPACK, "Accept": MSGPACK}}
+    return {"json": payload}
+
+
+def decode_response(resp: httpx.Response) -> Dict[str, Any]:
+    if resp.headers.get("content-type", "").startswith(MSGPACK):
+        return msgpack.unpackb(resp.content)
+    return resp.json()
+
+
+class AgentTransport:
+    """
+    Lazily creates one httpx.AsyncClient per agent and keeps it for the life of the process.
+
+    Args:
+        urls (dict): Step name -> agent base URL.
+        transport (httpx.AsyncBaseTransport): Optional transport override, e.g. httpx.ASGITransport
+            to route calls to in-process apps.
+    """
+
+    def __init__(self, urls: Dict[str, str] = AGENT_URLS, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.urls = dict(urls)
+        self.transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, step: str) -> httpx.AsyncClient:
+        client = self._clients.get(step)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=self.urls[step],
+                http2=AGENT_HTTP2,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=AGENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=AGENT_MAX_KEEPALIVE,
+                    keepalive_expiry=AGENT_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(
+                    connect=AGENT_CONNECT_TIMEOUT,
+                    read=AGENT_READ_TIMEOUT,
+                    write=AGENT_READ_TIMEOUT,
+                    pool=AGENT_POOL_TIMEOUT,
+                ),
+            )
+            self._clients[step] = client
+        return client
+
+    async def post(self, step: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST the payload to the agent's /run endpoint and return the decoded body.
+
+        Raises:
+            httpx.HTTPError: On connection errors, timeouts or non-2xx responses.
+        """
+        resp = await self.client(step).post("/run", **encode_request(payload))
+        record_transfer(step, len(resp.request.content), len(resp.content))
+        resp.raise_for_status()
+        return decode_response(resp)
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+agent_transport = AgentTransport()
@@ -0,0 +1,71 @@
+"""
+Content-addressed store for uploaded files.
+
+Each upload is stored once under its SHA-256 digest, so the same insurance card uploaded
+twice (or under the same filename as another card) maps to one stable, immutable path.
+"""
+import hashlib
+import os
+import tempfile
+import asyncio
+from pathlib import Path
+from typing import BinaryIO
+from fastapi import UploadFile
+
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "/uploads"))
+BLOB_DIR = UPLOAD_DIR / "blobs"
+CHUNK_SIZE = 1024 * 1024
+
+
+def blob_path(digest: str) -> Path:
+    return BLOB_DIR / digest[:2] / digest
+
+
+def _hash_stream(fileobj: BinaryIO) -> str:
+    sha = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+        sha.update(chunk)
+    return sha.hexdigest()
+
+
+def store_blob(fileobj: BinaryIO) -> Path:
+    """
+    Stream a file object into the store and return its blob path.
+
+    Seekable inputs (spooled uploads) are hashed first, so a blob that already exists
+    costs no write I/O. Other streams are hashed while being written to a temp file.
+    """
+    if fileobj.seekable():
+        start = fileobj.tell()
+        path = blob_path(_hash_stream(fileobj))
+        if path.exists():
+            return path
+        fileobj.seek(start)
+
+    BLOB_DIR.mkdir(parents=True, exist_ok=True)
+    sha = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(dir=BLOB_DIR, prefix=".incoming-", delete=False) as tmp:
+        try:
+            for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+                sha.update(chunk)
+                tmp.write(chunk)
+        except Exception:
+            os.unlink(tmp.name)
+            raise
+
+    path = blob_path(sha.hexdigest())
+    if path.exists():
+        os.unlink(tmp.name)
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Atomic rename: readers never see a partially written blob
+    os.replace(tmp.name, path)
+    return path
+
+
+async def store_upload(file: UploadFile) -> Path:
+    """
+    Store an UploadFile without blocking the event loop.
+    """
+    return await asyncio.to_thread(store_blob, file.file)
@@ -3,24 +3,105 @@ User may choose different wokflows, we initialize our langchain workflow based o
 """
 from concurrent.futures import thread
 from typing import Dict, Any
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
 from deps import RCMState
 
+# Steps for each workflow_type accepted by /run, mapped to the steps they depend on.
+# Steps with no dependencies start together; a step runs once all of its dependencies finish.
+WORKFLOW_STEPS: Dict[str, Dict[str, list[str]]] = {
+    "eligibility_only": {"eligibility": []},
+    "clinical_doc_only": {"clinical_doc": []},
+    "prior_auth_only": {"prior_auth": []},
+    # Kept in its original order: prior auth, then the clinical documentation
+    "pre_auth_clinical_doc": {
+        "eligibility": [],
+        "prior_auth": ["eligibility"],
+        "clinical_doc": ["prior_auth"],
+    },
+    "full": {
+        "eligibility": [],
+        "clinical_doc": [],
+        "prior_auth": ["eligibility", "clinical_doc"],
+        "medical_coding": ["clinical_doc"],
+        "claim_scrubbing": ["prior_auth", "medical_coding"],
+        "claim_submission": ["claim_scrubbing"],
+    },
+}
 
-def build_workflow(steps: list[str], TASK_REGISTRY: Dict[str, Any]) -> StateGraph:
+# Compiled graphs keyed by step signature, shared by every run in the process
+_compiled_workflows: Dict[tuple, Any] = {}
+
+
+def step_dependencies(steps) -> Dict[str, list[str]]:
+    """
+    Normalise a workflow definition to {step: [dependencies]}.
+
+    A plain list of steps is treated as a chain, each step depending on the one before it.
+    """
+    if isinstance(steps, dict):
+        dependencies = {step: list(deps) for step, deps in steps.items()}
+    else:
+        dependencies = {step: ([steps[i - 1]] if i else []) for i, step in enumerate(steps)}
+
+    for step, deps in dependencies.items():
+        unknown = [dep for dep in deps if dep not in dependencies]
+        if unknown:
+            raise ValueError(f"Step {step} depends on steps not in the workflow: {unknown}")
+    return dependencies
+
+
+def build_workflow(steps, TASK_REGISTRY: Dict[str, Any]) -> StateGraph:
+    dependencies = step_dependencies(steps)
     workflow = StateGraph(RCMState)
     
     # Add nodes
-    for step in steps:
+    for step in dependencies:
         workflow.add_node(step, TASK_REGISTRY[step])
 
-    # Wire them in sequence
-    for i in range(len(steps) - 1):
-        workflow.add_edge(steps[i], steps[i + 1])
+    # Independent steps fan out from the entry, dependent steps join on all of their dependencies
+    for step, deps in dependencies.items():
+        if not deps:
+            workflow.add_edge(START, step)
+        elif len(deps) == 1:
+            workflow.add_edge(deps[0], step)
+        else:
+            workflow.add_edge(deps, step)
 
-    # Mark entry and end
-    workflow.set_entry_point(steps[0])
-    workflow.add_edge(steps[-1], END)
+    # Steps nothing depends on finish the workflow
+    required = {dep for deps in dependencies.values() for dep in deps}
+    for step in dependencies:
+        if step not in required:
+            workflow.add_edge(step, END)
 
     return workflow
+
+
+def get_compiled_workflow(steps, TASK_REGISTRY: Dict[str, Any]):
+    """
+    Return the compiled graph for these steps, building it on first use.
+
+    Graphs are compiled without a checkpointer; callers bind one per run with
+    with_checkpointer().
+    """
+    key = tuple((step, tuple(deps)) for step, deps in step_dependencies(steps).items())
+    compiled = _compiled_workflows.get(key)
+    if compiled is None:
+        compiled = build_workflow(steps, TASK_REGISTRY).compile()
+        _compiled_workflows[key] = compiled
+    return compiled
+
+
+def with_checkpointer(compiled, checkpointer):
+    """
+    Shallow copy of a cached compiled graph bound to the given checkpointer.
+    """
+    return compiled.copy(update={"checkpointer": checkpointer})
+
+
+def precompile_workflows(TASK_REGISTRY: Dict[str, Any]):
+    """
+    Compile every known workflow_type up front so no request pays for graph construction.
+    """
+    for steps in WORKFLOW_STEPS.values():
+        get_compiled_workflow(steps, TASK_REGISTRY)